@@ -15,10 +15,17 @@ __email__ = "yashabalam707@gmail.com"
 __license__ = "MIT"
 __url__ = "https://github.com/yashab-cyber/nmap-ai"
 
-from .core.scanner import NmapAIScanner
-from .ai.script_generator import AIScriptGenerator
-from .ai.smart_scanner import SmartScanner
-from .ai.vulnerability_detector import VulnerabilityDetector
+import importlib
+
+# Public classes and the modules defining them. They are imported on first
+# access so that entry points (nmap-ai web, nmap-ai gui) only load what
+# they use rather than the scanner and every AI model on startup.
+_EXPORTS = {
+    "NmapAIScanner": ".core.scanner",
+    "AIScriptGenerator": ".ai.script_generator",
+    "SmartScanner": ".ai.smart_scanner",
+    "VulnerabilityDetector": ".ai.vulnerability_detector",
+}
 
 __all__ = [
     "NmapAIScanner",
@@ -26,3 +33,16 @@ __all__ = [
     "SmartScanner",
     "VulnerabilityDetector"
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
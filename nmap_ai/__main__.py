@@ -4,31 +4,85 @@ Main entry point for NMAP-AI application.
 
 import sys
 import argparse
-from .cli.main import cli_main
-from .gui.main import gui_main
-from .web.main import web_main
+from typing import List, Optional
 
+# Sub-commands that pick an interface; everything else goes to the CLI
+_INTERFACES = ("cli", "gui", "web")
 
-def main():
-    """Main entry point for the application."""
-    parser = argparse.ArgumentParser(description="NMAP-AI: AI-Powered Network Scanning")
+
+def _web_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser for the web server options.
+    
+    These options are only parsed once the web interface is chosen, so
+    CLI options of the same name reach the CLI untouched.
+    
+    Returns:
+        argparse.ArgumentParser: Parser for "nmap-ai web"
+    """
+    parser = argparse.ArgumentParser(
+        prog="nmap-ai web",
+        description="Run the NMAP-AI web interface",
+        allow_abbrev=False
+    )
+    parser.add_argument("--host", default="localhost", help="Web server host")
+    parser.add_argument("--port", type=int, default=8080, help="Web server port")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Web server worker processes (default: CPU count, at most 4, "
+                             "with NMAP_AI_REDIS_URL set, else 1)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Log web server requests and info messages")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Main entry point for the application.
+    
+    Only the module of the chosen interface is imported, so starting the
+    web server never loads the GUI or the CLI and vice versa.
+    
+    Args:
+        argv: Command line arguments without the program name (optional)
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # Help is handled here so "nmap-ai scan --help" reaches the CLI
+    parser = argparse.ArgumentParser(
+        description="NMAP-AI: AI-Powered Network Scanning",
+        epilog="Sub-commands: gui, web, cli (default); e.g. nmap-ai web --port 8080. "
+               "Run nmap-ai web --help for the web server options.",
+        add_help=False,
+        allow_abbrev=False
+    )
     parser.add_argument("--gui", action="store_true", help="Launch GUI interface")
     parser.add_argument("--web", action="store_true", help="Launch web interface")
-    parser.add_argument("--port", type=int, default=8080, help="Web server port")
     
     # If no args provided, show help
-    if len(sys.argv) == 1:
+    if not argv or argv[0] in ("-h", "--help"):
         parser.print_help()
         return
     
-    args, remaining = parser.parse_known_args()
+    # "nmap-ai web ..." is the same as "nmap-ai --web ...", while
+    # "nmap-ai cli ..." hands every argument (--help included) to the CLI
+    if argv[0] in _INTERFACES:
+        interface, remaining = argv[0], argv[1:]
+    else:
+        args, remaining = parser.parse_known_args(argv)
+        interface = "gui" if args.gui else "web" if args.web else "cli"
     
-    if args.gui:
+    if interface == "gui":
+        from .gui.main import gui_main
         gui_main()
-    elif args.web:
-        web_main(port=args.port)
+    elif interface == "web":
+        web_args = _web_parser().parse_args(remaining)
+        from .web.main import web_main
+        web_main(port=web_args.port, host=web_args.host,
+                 workers=web_args.workers, verbose=web_args.verbose)
     else:
         # Default to CLI with remaining args
+        from .cli.main import cli_main
         cli_main(remaining)
 
 
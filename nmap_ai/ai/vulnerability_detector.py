@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import re
 import numpy as np
+from collections import Counter
 from dataclasses import dataclass
 import requests
 import sqlite3
@@ -52,6 +53,40 @@ class VulnerabilityReport:
     vulnerabilities: List[Vulnerability]
     risk_score: float
     recommendations: List[str]
+    
+    def api_dict(self) -> Dict[str, Any]:
+        """
+        JSON-ready form of the report as returned by the web API.
+        
+        Returns:
+            Dict: Report fields with the scan time as an ISO 8601 string
+        """
+        return {
+            'target_ip': self.target_ip,
+            'scan_time': self.scan_time.isoformat(),
+            'total_vulnerabilities': self.total_vulnerabilities,
+            'severity_counts': {
+                'critical': self.critical_count,
+                'high': self.high_count,
+                'medium': self.medium_count,
+                'low': self.low_count
+            },
+            'risk_score': self.risk_score,
+            'vulnerabilities': [
+                {
+                    'cve_id': v.cve_id,
+                    'severity': v.severity,
+                    'score': v.score,
+                    'description': v.description,
+                    'affected_service': v.affected_service,
+                    'port': v.port,
+                    'exploit_available': v.exploit_available,
+                    'patch_available': v.patch_available
+                }
+                for v in self.vulnerabilities
+            ],
+            'recommendations': self.recommendations
+        }
 
 
 class VulnerabilityDetector:
@@ -339,13 +374,9 @@ class VulnerabilityDetector:
 
     def _generate_report(self, target_ip: str, vulnerabilities: List[Vulnerability]) -> VulnerabilityReport:
         """Generate a comprehensive vulnerability report."""
-        # Count vulnerabilities by severity
-        severity_counts = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
-        total_score = 0.0
-        
-        for vuln in vulnerabilities:
-            severity_counts[vuln.severity] += 1
-            total_score += vuln.score
+        # Count vulnerabilities by severity; missing severities count as 0
+        severity_counts = Counter(vuln.severity for vuln in vulnerabilities)
+        total_score = sum(vuln.score for vuln in vulnerabilities)
         
         # Calculate risk score
         risk_score = min(total_score / len(vulnerabilities) if vulnerabilities else 0.0, 10.0)
@@ -7,7 +7,7 @@ import json
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 
 @dataclass
@@ -63,11 +63,11 @@ class DatabaseConfig:
 @dataclass
 class NmapAIConfig:
     """Main configuration class."""
-    ai: AIConfig = AIConfig()
-    scanning: ScanConfig = ScanConfig()
-    output: OutputConfig = OutputConfig()
-    web: WebConfig = WebConfig()
-    database: DatabaseConfig = DatabaseConfig()
+    ai: AIConfig = field(default_factory=AIConfig)
+    scanning: ScanConfig = field(default_factory=ScanConfig)
+    output: OutputConfig = field(default_factory=OutputConfig)
+    web: WebConfig = field(default_factory=WebConfig)
+    database: DatabaseConfig = field(default_factory=DatabaseConfig)
     log_level: str = "INFO"
     debug: bool = False
 
@@ -179,3 +179,32 @@ def update_config(**kwargs) -> None:
     """Update the global configuration."""
     config_manager.update_config(**kwargs)
     config_manager.save_config()
+
+
+class Config:
+    """
+    Flat settings object used by the web API and the AI modules.
+    
+    Values start from the global configuration and may be changed on the
+    instance (e.g. through PUT /api/config) without touching the file.
+    """
+    
+    def __init__(self, config: Optional[NmapAIConfig] = None):
+        """
+        Initialize the settings.
+        
+        Args:
+            config: Configuration to read from (defaults to the global one)
+        """
+        config = config or get_config()
+        self.scanning_timeout = config.scanning.default_timeout
+        self.max_threads = config.scanning.max_parallel_hosts
+        self.default_ports = config.scanning.default_ports
+        self.enable_smart_scanning = True
+        self.enable_vulnerability_detection = True
+        self.ai_confidence_threshold = config.ai.confidence_threshold
+        self.default_output_format = config.output.default_format
+        self.results_dir = config.output.output_directory
+        self.data_dir = str(Path.home() / ".nmap-ai")
+        self.log_level = config.log_level
+        self.debug = config.debug
@@ -0,0 +1,3 @@
+"""
+GUI widgets for NMAP-AI
+"""
@@ -6,10 +6,66 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QLineEdit, QTextEdit, QPushButton, QComboBox,
     QCheckBox, QProgressBar, QGroupBox, QSpinBox,
-    QTabWidget, QSplitter, QFrame
+    QTabWidget, QFrame
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QIcon, QPalette
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QColor, QFont, QPalette
+
+from ...utils.logger import get_logger
+
+logger = get_logger("gui.scan_widget")
+
+
+# (combo label, nmap flags) pairs, indexed by the combo's currentIndex()
+_SCAN_TYPES = (
+    ("TCP SYN Scan (-sS)", "-sS"),
+    ("TCP Connect Scan (-sT)", "-sT"),
+    ("UDP Scan (-sU)", "-sU"),
+    ("Comprehensive Scan (-sS -sV -O)", "-sS -sV -O"),
+    ("Quick Scan (-T4 -F)", "-T4 -F"),
+    ("Intense Scan (-T4 -A -v)", "-T4 -A -v"),
+)
+
+_TIMING_TEMPLATES = (
+    ("T0 (Paranoid)", "-T0"),
+    ("T1 (Sneaky)", "-T1"),
+    ("T2 (Polite)", "-T2"),
+    ("T3 (Normal)", "-T3"),
+    ("T4 (Aggressive)", "-T4"),
+    ("T5 (Insane)", "-T5"),
+)
+
+
+class PluginDiscoverySignals(QObject):
+    """Signals emitted by PluginDiscoveryWorker."""
+    
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+
+class PluginDiscoveryWorker(QRunnable):
+    """Discover and load plugins off the GUI thread."""
+    
+    def __init__(self, plugin_manager, load=True):
+        super().__init__()
+        self.plugin_manager = plugin_manager
+        self.load = load
+        self.signals = PluginDiscoverySignals()
+        
+    def run(self):
+        """Scan plugin directories and load every plugin in one batch."""
+        try:
+            plugin_names = self.plugin_manager.discover_plugins()
+            if self.load:
+                plugin_names = [
+                    name for name in plugin_names
+                    if self.plugin_manager.load_plugin(name)
+                ]
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+            
+        self.signals.finished.emit(plugin_names)
 
 
 class ScanWidget(QWidget):
@@ -20,15 +76,25 @@ class ScanWidget(QWidget):
     scan_completed = pyqtSignal(dict)
     scan_progress = pyqtSignal(int, str)
     scan_error = pyqtSignal(str)
+    plugins_loaded = pyqtSignal(list)
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, plugin_manager=None):
         super().__init__(parent)
+        self._last_progress = -1
         self.init_ui()
         self.scan_thread = None
+        self.plugin_manager = plugin_manager
+        if plugin_manager is not None:
+            self.load_plugins(plugin_manager)
         
     def init_ui(self):
         """Initialize the user interface."""
+        # Defer repaints until the whole widget tree is built
+        self.setUpdatesEnabled(False)
+        
         layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
         
         # Create tab widget for different scan options
         self.tab_widget = QTabWidget()
@@ -55,6 +121,24 @@ class ScanWidget(QWidget):
         button_layout = self.create_button_layout()
         layout.addLayout(button_layout)
         
+        # Bound getters for get_scan_configuration, resolved once
+        self._cfg_getters = (
+            ('scan_type', self.scan_type_combo.currentText),
+            ('timing', self.timing_combo.currentText),
+            ('os_detection', self.os_detection_check.isChecked),
+            ('service_detection', self.service_detection_check.isChecked),
+            ('script_scan', self.script_scan_check.isChecked),
+            ('aggressive', self.aggressive_check.isChecked),
+            ('ai_enabled', self.ai_enabled_check.isChecked),
+            ('vulnerability_analysis', self.vulnerability_analysis_check.isChecked),
+            ('smart_scripts', self.smart_script_selection_check.isChecked),
+            ('anomaly_detection', self.anomaly_detection_check.isChecked),
+            ('max_hosts', self.max_hosts_spin.value),
+            ('top_ports', self.top_ports_check.isChecked),
+        )
+        
+        self.setUpdatesEnabled(True)
+        
     def create_basic_scan_tab(self):
         """Create the basic scan configuration tab."""
         widget = QWidget()
@@ -72,14 +156,7 @@ class ScanWidget(QWidget):
         
         target_layout.addWidget(QLabel("Scan Type:"), 1, 0)
         self.scan_type_combo = QComboBox()
-        self.scan_type_combo.addItems([
-            "TCP SYN Scan (-sS)",
-            "TCP Connect Scan (-sT)",
-            "UDP Scan (-sU)",
-            "Comprehensive Scan (-sS -sV -O)",
-            "Quick Scan (-T4 -F)",
-            "Intense Scan (-T4 -A -v)"
-        ])
+        self.scan_type_combo.addItems([label for label, _ in _SCAN_TYPES])
         target_layout.addWidget(self.scan_type_combo, 1, 1)
         
         layout.addWidget(target_group)
@@ -111,10 +188,7 @@ class ScanWidget(QWidget):
         
         timing_layout.addWidget(QLabel("Timing Template:"), 0, 0)
         self.timing_combo = QComboBox()
-        self.timing_combo.addItems([
-            "T0 (Paranoid)", "T1 (Sneaky)", "T2 (Polite)",
-            "T3 (Normal)", "T4 (Aggressive)", "T5 (Insane)"
-        ])
+        self.timing_combo.addItems([label for label, _ in _TIMING_TEMPLATES])
         self.timing_combo.setCurrentIndex(3)  # T3 Normal
         timing_layout.addWidget(self.timing_combo, 0, 1)
         
@@ -205,6 +279,13 @@ class ScanWidget(QWidget):
         self.status_label.setWordWrap(True)
         layout.addWidget(self.status_label)
         
+        # Prebuilt palettes so status color changes skip the stylesheet parser
+        self._status_palettes = {}
+        for color in ('red', 'green', 'orange', 'blue'):
+            palette = self.status_label.palette()
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(color))
+            self._status_palettes[color] = palette
+        
         return frame
         
     def create_button_layout(self):
@@ -266,13 +347,13 @@ class ScanWidget(QWidget):
         
         if not scan_config['targets']:
             self.status_label.setText("Error: No targets specified")
-            self.status_label.setStyleSheet("color: red;")
+            self.status_label.setPalette(self._status_palettes['red'])
             return
             
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
+        self.set_progress_value(0)
         self.progress_label.setText("Initializing scan...")
         
         # Emit scan started signal
@@ -285,7 +366,7 @@ class ScanWidget(QWidget):
             
         self.reset_ui_state()
         self.status_label.setText("Scan stopped by user")
-        self.status_label.setStyleSheet("color: orange;")
+        self.status_label.setPalette(self._status_palettes['orange'])
         
     def clear_form(self):
         """Clear all form inputs."""
@@ -308,46 +389,64 @@ class ScanWidget(QWidget):
         targets = [line.strip() for line in self.target_input.toPlainText().split('\n') 
                   if line.strip()]
                   
-        config = {
-            'targets': targets,
-            'scan_type': self.scan_type_combo.currentText(),
-            'ports': self.port_input.text().strip(),
-            'timing': self.timing_combo.currentText(),
-            'os_detection': self.os_detection_check.isChecked(),
-            'service_detection': self.service_detection_check.isChecked(),
-            'script_scan': self.script_scan_check.isChecked(),
-            'aggressive': self.aggressive_check.isChecked(),
-            'ai_enabled': self.ai_enabled_check.isChecked(),
-            'vulnerability_analysis': self.vulnerability_analysis_check.isChecked(),
-            'smart_scripts': self.smart_script_selection_check.isChecked(),
-            'anomaly_detection': self.anomaly_detection_check.isChecked(),
-            'max_hosts': self.max_hosts_spin.value(),
-            'top_ports': self.top_ports_check.isChecked()
-        }
+        config = {k: getter() for k, getter in self._cfg_getters}
+        config['targets'] = targets
+        config['ports'] = self.port_input.text().strip()
+        config['scan_flags'] = _SCAN_TYPES[self.scan_type_combo.currentIndex()][1]
+        config['timing_flag'] = _TIMING_TEMPLATES[self.timing_combo.currentIndex()][1]
         
         return config
         
     def update_progress(self, value, message):
         """Update the progress display."""
+        if self.set_progress_value(value):
+            self.progress_label.setText(f"Progress: {value}%")
+        if message != self.status_label.text():
+            self.status_label.setText(message)
+        self.status_label.setPalette(self._status_palettes['blue'])
+        
+    def set_progress_value(self, value):
+        """Set the progress bar value, skipping repaints when unchanged."""
+        if value == self._last_progress:
+            return False
         self.progress_bar.setValue(value)
-        self.progress_label.setText(f"Progress: {value}%")
-        self.status_label.setText(message)
-        self.status_label.setStyleSheet("color: blue;")
+        self._last_progress = value
+        return True
         
     def scan_completed_handler(self, results):
         """Handle scan completion."""
         self.reset_ui_state()
-        self.progress_bar.setValue(100)
+        self.set_progress_value(100)
         self.progress_label.setText("Scan completed successfully")
         self.status_label.setText(f"Found {len(results.get('hosts', []))} hosts")
-        self.status_label.setStyleSheet("color: green;")
+        self.status_label.setPalette(self._status_palettes['green'])
         
     def scan_error_handler(self, error_message):
         """Handle scan errors."""
         self.reset_ui_state()
         self.progress_label.setText("Scan failed")
         self.status_label.setText(f"Error: {error_message}")
-        self.status_label.setStyleSheet("color: red;")
+        self.status_label.setPalette(self._status_palettes['red'])
+        
+    def load_plugins(self, plugin_manager):
+        """Discover and load plugins in the background."""
+        worker = PluginDiscoveryWorker(plugin_manager)
+        worker.signals.finished.connect(self.plugins_loaded_handler)
+        worker.signals.error.connect(self.plugin_load_error_handler)
+        QThreadPool.globalInstance().start(worker)
+        
+    @pyqtSlot(list)
+    def plugins_loaded_handler(self, plugin_names):
+        """Handle completion of background plugin loading."""
+        self.status_label.setText(f"Loaded {len(plugin_names)} plugins")
+        self.plugins_loaded.emit(plugin_names)
+        
+    @pyqtSlot(str)
+    def plugin_load_error_handler(self, error_message):
+        """Handle plugin loading errors without touching the scan controls."""
+        logger.error(f"Plugin loading failed: {error_message}")
+        self.status_label.setText(f"Plugin loading failed: {error_message}")
+        self.status_label.setPalette(self._status_palettes['red'])
         
     def reset_ui_state(self):
         """Reset UI to initial state."""
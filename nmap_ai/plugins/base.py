@@ -3,27 +3,61 @@ Base plugin classes for NMAP-AI plugin system.
 
 This module defines the base classes that all plugins should inherit from
 to ensure proper integration with the NMAP-AI framework.
+
+Plugin modules should name their entry class with a module-level
+``PLUGIN_CLASS`` attribute so the manager can find it without scanning
+the module namespace::
+
+    class MyPlugin(ScannerPlugin):
+        ...
+    
+    PLUGIN_CLASS = MyPlugin
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+from importlib.machinery import SourceFileLoader
 from pathlib import Path
+import importlib.util
 import logging
+import os
+import sys
+import time
 from dataclasses import dataclass
+from functools import cached_property
 
 from ..utils.logger import get_logger
 
+# sys.modules prefix for loaded plugins, keeps them from shadowing real modules
+_PLUGIN_MODULE_PREFIX = "nmap_ai_plugin_"
+
+# Listings of directories changed more recently than this are not cached:
+# an entry added within the same mtime tick would leave the mtime unchanged
+_DISCOVER_SETTLE_NS = 2 * 10**9
+
 
-@dataclass
+@dataclass(frozen=True)
 class PluginMetadata:
-    """Plugin metadata information."""
+    """
+    Plugin metadata information.
+    
+    Instances are immutable and hashable; lists passed for
+    ``dependencies`` or ``supported_platforms`` are stored as tuples.
+    """
+    __slots__ = ('name', 'version', 'description', 'author', 'license',
+                 'dependencies', 'supported_platforms')
+    
     name: str
     version: str
     description: str
     author: str
     license: str
-    dependencies: List[str]
-    supported_platforms: List[str]
+    dependencies: Tuple[str, ...]
+    supported_platforms: Tuple[str, ...]
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'dependencies', tuple(self.dependencies))
+        object.__setattr__(self, 'supported_platforms', tuple(self.supported_platforms))
 
 
 class BasePlugin(ABC):
@@ -33,6 +67,11 @@ class BasePlugin(ABC):
     All plugins must inherit from this class and implement the required methods.
     """
     
+    __slots__ = ('config', 'logger', '_enabled', '_initialized')
+    
+    # Capability bits advertised by each plugin family
+    CAPABILITIES = 0
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the plugin.
@@ -97,7 +136,7 @@ class BasePlugin(ABC):
         
         Args:
             config: Configuration to validate
-            
+        
         Returns:
             bool: True if configuration is valid
         """
@@ -113,6 +152,9 @@ class ScannerPlugin(BasePlugin):
     or post-process scan results.
     """
     
+    __slots__ = ()
+    CAPABILITIES = 1 << 0
+    
     @abstractmethod
     def pre_scan_hook(self, targets: List[str], scan_options: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -121,7 +163,7 @@ class ScannerPlugin(BasePlugin):
         Args:
             targets: List of scan targets
             scan_options: Scan configuration options
-            
+        
         Returns:
             Dict: Modified scan options
         """
@@ -134,7 +176,7 @@ class ScannerPlugin(BasePlugin):
         
         Args:
             scan_results: Raw scan results
-            
+        
         Returns:
             Dict: Modified scan results
         """
@@ -147,7 +189,7 @@ class ScannerPlugin(BasePlugin):
         Args:
             targets: List of scan targets
             **kwargs: Additional scan parameters
-            
+        
         Returns:
             Optional[Dict]: Custom scan results or None if not implemented
         """
@@ -161,6 +203,9 @@ class ReportPlugin(BasePlugin):
     Report plugins can add new output formats or modify existing reports.
     """
     
+    __slots__ = ('_formats_lower',)
+    CAPABILITIES = 1 << 1
+    
     @property
     @abstractmethod
     def supported_formats(self) -> List[str]:
@@ -176,7 +221,7 @@ class ReportPlugin(BasePlugin):
             scan_results: Scan results to generate report from
             format_type: Report format type
             output_path: Optional output file path
-            
+        
         Returns:
             Union[str, bytes]: Generated report content
         """
@@ -188,11 +233,24 @@ class ReportPlugin(BasePlugin):
         
         Args:
             format_type: Format to validate
-            
+        
         Returns:
             bool: True if format is supported
         """
-        return format_type.lower() in [f.lower() for f in self.supported_formats]
+        try:
+            formats = self._formats_lower
+        except AttributeError:
+            formats = self._formats_lower = frozenset(
+                f.lower() for f in self.supported_formats
+            )
+        return format_type.lower() in formats
+    
+    def invalidate_format_cache(self) -> None:
+        """Discard cached formats after supported_formats changes at runtime."""
+        try:
+            del self._formats_lower
+        except AttributeError:
+            pass
 
 
 class AIPlugin(BasePlugin):
@@ -203,6 +261,9 @@ class AIPlugin(BasePlugin):
     or intelligent automation features.
     """
     
+    __slots__ = ()
+    CAPABILITIES = 1 << 2
+    
     @property
     @abstractmethod
     def model_requirements(self) -> List[str]:
@@ -226,7 +287,7 @@ class AIPlugin(BasePlugin):
         
         Args:
             scan_results: Raw scan results
-            
+        
         Returns:
             Dict: Analysis results with AI insights
         """
@@ -238,7 +299,7 @@ class AIPlugin(BasePlugin):
         
         Args:
             training_data: Training data samples
-            
+        
         Returns:
             bool: True if training successful
         """
@@ -252,7 +313,7 @@ class AIPlugin(BasePlugin):
         
         Args:
             analysis_results: AI analysis results
-            
+        
         Returns:
             float: Confidence score between 0.0 and 1.0
         """
@@ -273,7 +334,13 @@ class PluginManager:
         """
         self.plugin_dirs = plugin_dirs or []
         self.plugins: Dict[str, BasePlugin] = {}
-        self.logger = get_logger("plugin_manager")
+        self._discover_cache: Dict[Path, Tuple[int, List[str]]] = {}
+        self._caps_mask = 0
+    
+    @cached_property
+    def logger(self) -> logging.Logger:
+        """Plugin manager logger, created on first use."""
+        return get_logger("plugin_manager")
     
     def discover_plugins(self) -> List[str]:
         """
@@ -285,16 +352,30 @@ class PluginManager:
         discovered = []
         
         for plugin_dir in self.plugin_dirs:
-            if not plugin_dir.exists():
-                continue
+            try:
+                mtime_ns = plugin_dir.stat().st_mtime_ns
                 
-            for plugin_file in plugin_dir.glob("*.py"):
-                if plugin_file.name.startswith("__"):
+                # Directory mtime changes whenever an entry is added or removed,
+                # so an unchanged mtime means the previous listing is still valid
+                cached = self._discover_cache.get(plugin_dir)
+                if cached is not None and cached[0] == mtime_ns:
+                    discovered.extend(cached[1])
                     continue
-                    
-                plugin_name = plugin_file.stem
-                discovered.append(plugin_name)
                 
+                names = []
+                with os.scandir(plugin_dir) as it:
+                    for entry in it:
+                        if (entry.is_file() and entry.name.endswith(".py") and
+                                not entry.name.startswith("__")):
+                            names.append(entry.name[:-3])
+            except OSError:
+                # Missing, unreadable or not a directory
+                continue
+            
+            if time.time_ns() - mtime_ns >= _DISCOVER_SETTLE_NS:
+                self._discover_cache[plugin_dir] = (mtime_ns, names)
+            discovered.extend(names)
+        
         return discovered
     
     def load_plugin(self, plugin_name: str, config: Optional[Dict[str, Any]] = None) -> bool:
@@ -304,14 +385,12 @@ class PluginManager:
         Args:
             plugin_name: Name of plugin to load
             config: Plugin configuration
-            
+        
         Returns:
             bool: True if plugin loaded successfully
         """
+        module_name = f"{_PLUGIN_MODULE_PREFIX}{plugin_name}"
         try:
-            # Import plugin module dynamically
-            import importlib.util
-            
             plugin_path = None
             for plugin_dir in self.plugin_dirs:
                 potential_path = plugin_dir / f"{plugin_name}.py"
@@ -320,70 +399,106 @@ class PluginManager:
                     break
             
             if not plugin_path:
-                self.logger.error(f"Plugin {plugin_name} not found")
+                self.logger.error("Plugin %s not found", plugin_name)
                 return False
             
-            # Load plugin module
-            spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
-            if not spec or not spec.loader:
-                self.logger.error(f"Failed to load plugin spec for {plugin_name}")
+            # Load plugin module; SourceFileLoader reuses __pycache__ bytecode
+            loader = SourceFileLoader(module_name, str(plugin_path))
+            spec = importlib.util.spec_from_loader(module_name, loader)
+            if not spec:
+                self.logger.error("Failed to load plugin spec for %s", plugin_name)
                 return False
-                
+            
             module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            # Register before executing so dataclasses, pickling and
+            # re-imports inside the plugin resolve the module from cache
+            sys.modules[module_name] = module
+            loader.exec_module(module)
             
             # Find plugin class
-            plugin_class = None
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (isinstance(attr, type) and 
-                    issubclass(attr, BasePlugin) and 
-                    attr != BasePlugin and
-                    not attr.__name__.startswith('_')):
-                    plugin_class = attr
-                    break
+            plugin_class = getattr(module, "PLUGIN_CLASS", None)
+            if plugin_class is None:
+                plugin_class = self._find_plugin_class(module)
             
             if not plugin_class:
-                self.logger.error(f"No plugin class found in {plugin_name}")
+                self.logger.error("No plugin class found in %s", plugin_name)
+                sys.modules.pop(module_name, None)
+                return False
+            
+            if not (isinstance(plugin_class, type) and issubclass(plugin_class, BasePlugin)):
+                self.logger.error("PLUGIN_CLASS of %s is not a BasePlugin subclass: %r",
+                                  plugin_name, plugin_class)
+                sys.modules.pop(module_name, None)
                 return False
             
             # Initialize plugin
             plugin = plugin_class(config)
             if not plugin.initialize():
-                self.logger.error(f"Failed to initialize plugin {plugin_name}")
+                self.logger.error("Failed to initialize plugin %s", plugin_name)
+                sys.modules.pop(module_name, None)
                 return False
             
             self.plugins[plugin_name] = plugin
-            self.logger.info(f"Successfully loaded plugin {plugin_name}")
+            self._caps_mask |= plugin_class.CAPABILITIES
+            self.logger.info("Successfully loaded plugin %s", plugin_name)
             return True
-            
+        
         except Exception as e:
-            self.logger.error(f"Error loading plugin {plugin_name}: {e}")
+            self.logger.error("Error loading plugin %s: %s", plugin_name, e)
+            sys.modules.pop(module_name, None)
             return False
     
+    @staticmethod
+    def _find_plugin_class(module: Any) -> Optional[type]:
+        """
+        Find the first plugin class defined in a module.
+        
+        Fallback for plugins that do not declare ``PLUGIN_CLASS``. Walks the
+        module ``__dict__`` directly and ignores classes imported from
+        elsewhere, such as the base classes themselves.
+        
+        Args:
+            module: Loaded plugin module
+        
+        Returns:
+            Optional[type]: Plugin class or None if not found
+        """
+        module_name = module.__name__
+        for attr_name, attr in module.__dict__.items():
+            if (isinstance(attr, type) and
+                issubclass(attr, BasePlugin) and
+                attr.__module__ == module_name and
+                not attr_name.startswith('_')):
+                return attr
+        return None
+    
     def unload_plugin(self, plugin_name: str) -> bool:
         """
         Unload a plugin.
         
         Args:
             plugin_name: Name of plugin to unload
-            
+        
         Returns:
             bool: True if plugin unloaded successfully
         """
         if plugin_name not in self.plugins:
-            self.logger.warning(f"Plugin {plugin_name} not loaded")
+            self.logger.warning("Plugin %s not loaded", plugin_name)
             return False
         
         try:
             plugin = self.plugins[plugin_name]
             plugin.cleanup()
             del self.plugins[plugin_name]
-            self.logger.info(f"Successfully unloaded plugin {plugin_name}")
+            sys.modules.pop(f"{_PLUGIN_MODULE_PREFIX}{plugin_name}", None)
+            self._caps_mask = 0
+            for remaining in self.plugins.values():
+                self._caps_mask |= type(remaining).CAPABILITIES
+            self.logger.info("Successfully unloaded plugin %s", plugin_name)
             return True
-            
+        
         except Exception as e:
-            self.logger.error(f"Error unloading plugin {plugin_name}: {e}")
+            self.logger.error("Error unloading plugin %s: %s", plugin_name, e)
             return False
     
     def get_plugin(self, plugin_name: str) -> Optional[BasePlugin]:
@@ -392,7 +507,7 @@ class PluginManager:
         
         Args:
             plugin_name: Name of plugin to get
-            
+        
         Returns:
             Optional[BasePlugin]: Plugin instance or None if not found
         """
@@ -404,7 +519,7 @@ class PluginManager:
         
         Args:
             plugin_type: Optional plugin type to filter by
-            
+        
         Returns:
             List[str]: List of plugin names
         """
@@ -416,6 +531,19 @@ class PluginManager:
             if isinstance(plugin, plugin_type)
         ]
     
+    def has_capability(self, capabilities: int) -> bool:
+        """
+        Check whether any loaded plugin provides the given capabilities.
+        
+        Args:
+            capabilities: Bitmask of plugin CAPABILITIES values,
+                e.g. ``ScannerPlugin.CAPABILITIES``
+        
+        Returns:
+            bool: True if every requested capability bit is provided
+        """
+        return self._caps_mask & capabilities == capabilities
+    
     def cleanup_all(self) -> None:
         """Cleanup all loaded plugins."""
         for plugin_name in list(self.plugins.keys()):
@@ -0,0 +1,21 @@
+# cython: language_level=3
+"""
+Augmenting declarations for helpers.py.
+
+When Cython is available at build time setup.py compiles helpers.py and
+these declarations make the listed functions cpdef, with C-typed locals
+where their values are bounded. The Python source is unchanged and
+remains the fallback when no extension is built.
+"""
+
+cimport cython
+
+
+@cython.locals(exponent=Py_ssize_t)
+cpdef str format_bytes(bytes_count)
+
+# Port numbers and lengths stay Python ints: a C integer would raise
+# OverflowError on huge values the pure-Python module accepts
+cpdef list parse_port_range(str port_spec)
+
+cpdef str truncate_string(str text, max_length, str suffix=*)
@@ -2,18 +2,50 @@
 Helper utilities for NMAP-AI
 """
 
+import io
+import os
 import json
+import math
+import mmap
+import fnmatch
 import time
 import hashlib
 import platform
+import stat
 import subprocess
-from typing import Any, Dict, List, Optional, Union
-from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional, Tuple, Union
+from datetime import datetime
 from pathlib import Path
 
-
-def get_system_info() -> Dict[str, str]:
-    """Get system information."""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Matches json.dump(indent=2, default=str): non-string keys are stringified
+# and datetimes go through default=str rather than orjson's RFC 3339 form
+_ORJSON_SAVE_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY |
+    orjson.OPT_PASSTHROUGH_DATETIME
+) if orjson is not None else 0
+
+# Files smaller than this are read directly instead of memory-mapped
+_MMAP_HASH_THRESHOLD = 64 * 1024
+# Read size used when a file cannot be memory-mapped
+_HASH_CHUNK_SIZE = 1024 * 1024
+# Port specs covering more ports than this are expanded with NumPy
+_NUMPY_PORT_THRESHOLD = 256
+# Sockets opened at once by are_ports_open, keeps well below fd limits
+_PORT_PROBE_BATCH = 256
+# format_bytes units and their divisors, indexed by the power of 1024
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+_BYTE_DIVISORS = tuple(float(1 << (10 * i)) for i in range(len(_BYTE_UNITS)))
+
+
+@lru_cache(maxsize=1)
+def _system_info() -> Dict[str, str]:
     return {
         'platform': platform.system(),
         'platform_version': platform.version(),
@@ -23,6 +55,16 @@ def get_system_info() -> Dict[str, str]:
     }
 
 
+def get_system_info() -> Dict[str, str]:
+    """
+    Get system information.
+    
+    Computed once per process; call ``_system_info.cache_clear()`` to
+    refresh it.
+    """
+    return dict(_system_info())
+
+
 def format_duration(seconds: float) -> str:
     """Format duration in seconds to human readable format."""
     if seconds < 60:
@@ -37,11 +79,19 @@ def format_duration(seconds: float) -> str:
 
 def format_bytes(bytes_count: int) -> str:
     """Format bytes to human readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_count < 1024.0:
-            return f"{bytes_count:.1f} {unit}"
-        bytes_count /= 1024.0
-    return f"{bytes_count:.1f} PB"
+    if bytes_count < 1024:
+        return f"{bytes_count:.1f} B"
+    
+    # Pick the unit from the binary exponent instead of dividing in a loop
+    if isinstance(bytes_count, int):
+        exponent = (bytes_count.bit_length() - 1) // 10
+    elif math.isfinite(bytes_count):
+        exponent = (math.frexp(bytes_count)[1] - 1) // 10
+    else:
+        return f"{bytes_count:.1f} PB"
+    if exponent > 5:
+        exponent = 5
+    return f"{bytes_count / _BYTE_DIVISORS[exponent]:.1f} {_BYTE_UNITS[exponent]}"
 
 
 def get_file_hash(file_path: str, algorithm: str = 'sha256') -> str:
@@ -50,25 +100,68 @@ def get_file_hash(file_path: str, algorithm: str = 'sha256') -> str:
     
     try:
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_algo.update(chunk)
+            size = os.fstat(f.fileno()).st_size
+            if size < _MMAP_HASH_THRESHOLD:
+                hash_algo.update(f.read())
+                return hash_algo.hexdigest()
+            
+            # Hash the whole mapping in one call so OpenSSL sees one buffer
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hash_algo.update(mm)
+            except (OSError, ValueError):
+                f.seek(0)
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                    hash_algo.update(chunk)
         return hash_algo.hexdigest()
     except Exception as e:
         raise ValueError(f"Could not hash file {file_path}: {e}")
 
 
+def hash_files(paths: List[str], algorithm: str = 'sha256',
+               workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Hash several files concurrently.
+    
+    hashlib releases the GIL while digesting large buffers, so a thread
+    pool hashes independent files in parallel.
+    
+    Args:
+        paths: Files to hash
+        algorithm: Any algorithm accepted by hashlib.new
+        workers: Maximum number of threads (ThreadPoolExecutor default if None)
+    
+    Returns:
+        Dict mapping each path to its hex digest
+    
+    Raises:
+        ValueError: If any file cannot be hashed
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    paths = list(paths)
+    if len(paths) <= 1:
+        return {path: get_file_hash(path, algorithm) for path in paths}
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        digests = executor.map(partial(get_file_hash, algorithm=algorithm), paths)
+        return dict(zip(paths, digests))
+
+
 def ensure_directory(directory: str) -> Path:
     """Ensure directory exists, create if it doesn't."""
-    path = Path(directory)
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    os.makedirs(directory, exist_ok=True)
+    return Path(directory)
 
 
 def safe_json_load(file_path: str) -> Optional[Dict[str, Any]]:
     """Safely load JSON file."""
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
     except Exception:
         return None
 
@@ -76,65 +169,96 @@ def safe_json_load(file_path: str) -> Optional[Dict[str, Any]]:
 def safe_json_save(data: Dict[str, Any], file_path: str) -> bool:
     """Safely save data to JSON file."""
     try:
-        ensure_directory(str(Path(file_path).parent))
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        parent = os.path.dirname(file_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        content = None
+        if orjson is not None:
+            try:
+                content = orjson.dumps(data, option=_ORJSON_SAVE_OPTIONS, default=str)
+            except TypeError:
+                pass  # e.g. integers beyond 64 bits; let the stdlib encoder try
+        if content is None:
+            content = json.dumps(data, indent=2, default=str).encode('utf-8')
+        with open(file_path, 'wb') as f:
+            f.write(content)
         return True
     except Exception:
         return False
 
 
-def is_nmap_installed() -> bool:
-    """Check if Nmap is installed and accessible."""
+@lru_cache(maxsize=1)
+def _nmap_probe() -> Tuple[bool, Optional[str]]:
+    """
+    Run ``nmap --version`` once and return (installed, version).
+    
+    Shared by is_nmap_installed and get_nmap_version; call
+    ``_nmap_probe.cache_clear()`` after installing or upgrading Nmap.
+    """
     try:
         result = subprocess.run(['nmap', '--version'], 
                               capture_output=True, 
                               text=True, 
                               timeout=10)
-        return result.returncode == 0
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        return False
+        return False, None
+    
+    if result.returncode != 0:
+        return False, None
+    
+    # Extract version from output
+    for line in result.stdout.split('\n'):
+        if 'Nmap version' in line:
+            return True, line.split('version')[1].strip()
+    return True, None
+
+
+def is_nmap_installed() -> bool:
+    """Check if Nmap is installed and accessible."""
+    return _nmap_probe()[0]
 
 
 def get_nmap_version() -> Optional[str]:
     """Get installed Nmap version."""
-    try:
-        result = subprocess.run(['nmap', '--version'], 
-                              capture_output=True, 
-                              text=True, 
-                              timeout=10)
-        if result.returncode == 0:
-            # Extract version from output
-            for line in result.stdout.split('\n'):
-                if 'Nmap version' in line:
-                    return line.split('version')[1].strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return None
+    return _nmap_probe()[1]
 
 
 def parse_port_range(port_spec: str) -> List[int]:
     """Parse port specification into list of ports."""
-    ports = []
+    spans = []
+    total = 0
+    highest = 0
     
     for part in port_spec.split(','):
         part = part.strip()
         
         if '-' in part:
-            start, end = part.split('-', 1)
-            start, end = int(start.strip()), int(end.strip())
-            ports.extend(range(start, end + 1))
+            low, high = part.split('-', 1)
+            start, end = int(low.strip()), int(high.strip())
         else:
-            ports.append(int(part))
+            start = end = int(part)
+        spans.append((start, end))
+        total += max(end - start + 1, 0)
+        highest = max(highest, end)
+    
+    if total <= _NUMPY_PORT_THRESHOLD:
+        ports = set()
+        for start, end in spans:
+            ports.update(range(start, end + 1))
+        return sorted(ports)  # Remove duplicates and sort
     
-    return sorted(list(set(ports)))  # Remove duplicates and sort
+    import numpy as np
+    
+    # A presence mask deduplicates and orders ports without sorting
+    mask = np.zeros(highest + 1, dtype=bool)
+    for start, end in spans:
+        mask[start:end + 1] = True
+    return np.flatnonzero(mask).tolist()
 
 
 def generate_report_id() -> str:
     """Generate unique report ID."""
-    timestamp = int(time.time())
-    random_part = hashlib.md5(str(timestamp).encode()).hexdigest()[:8]
-    return f"report_{timestamp}_{random_part}"
+    return f"report_{time.time_ns()}_{os.urandom(4).hex()}"
 
 
 def truncate_string(text: str, max_length: int, suffix: str = "...") -> str:
@@ -170,16 +294,31 @@ def clean_old_files(directory: str, max_age_days: int = 7, pattern: str = "*"):
     if not directory_path.exists():
         return
     
-    cutoff_time = datetime.now() - timedelta(days=max_age_days)
+    cutoff_ts = time.time() - max_age_days * 86400.0
     
-    for file_path in directory_path.glob(pattern):
-        if file_path.is_file():
-            file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-            if file_time < cutoff_time:
+    if '/' not in pattern and os.sep not in pattern and '**' not in pattern:
+        # Flat pattern: one directory listing with cached DirEntry stats
+        match_all = pattern == '*'
+        with os.scandir(directory) as it:
+            for entry in it:
                 try:
-                    file_path.unlink()
-                except Exception:
+                    if not entry.is_file():
+                        continue
+                    if not match_all and not fnmatch.fnmatch(entry.name, pattern):
+                        continue
+                    if entry.stat().st_mtime < cutoff_ts:
+                        os.unlink(entry.path)
+                except OSError:
                     pass  # Ignore errors when cleaning up
+        return
+    
+    for file_path in directory_path.glob(pattern):
+        try:
+            stat_result = file_path.stat()
+            if stat.S_ISREG(stat_result.st_mode) and stat_result.st_mtime < cutoff_ts:
+                file_path.unlink()
+        except Exception:
+            pass  # Ignore errors when cleaning up
 
 
 def get_available_memory() -> Optional[int]:
@@ -193,124 +332,253 @@ def get_available_memory() -> Optional[int]:
 
 def is_port_open(host: str, port: int, timeout: float = 3.0) -> bool:
     """Check if a port is open on a host."""
+    return are_ports_open(host, [port], timeout).get(port, False)
+
+
+def are_ports_open(host: str, ports: List[int], timeout: float = 3.0) -> Dict[int, bool]:
+    """
+    Check several ports on a host concurrently.
+    
+    Non-blocking connects are issued for a batch of ports and completion is
+    collected through a selector, so each batch takes at most ``timeout``
+    seconds instead of ``timeout`` per port.
+    
+    Args:
+        host: Hostname or IPv4 address
+        ports: Ports to probe
+        timeout: Connect timeout in seconds for each batch
+    
+    Returns:
+        Dict mapping each port to True if it accepted a connection
+    """
+    import errno
+    import selectors
     import socket
     
+    results = {port: False for port in ports}
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.settimeout(timeout)
-            result = sock.connect_ex((host, port))
-            return result == 0
-    except Exception:
-        return False
+        address = socket.gethostbyname(host)
+    except (OSError, UnicodeError):
+        return results
+    
+    in_progress = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY,
+                   getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+    unique_ports = list(results)
+    
+    for offset in range(0, len(unique_ports), _PORT_PROBE_BATCH):
+        with selectors.DefaultSelector() as selector:
+            for port in unique_ports[offset:offset + _PORT_PROBE_BATCH]:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                try:
+                    sock.setblocking(False)
+                    err = sock.connect_ex((address, port))
+                except (OSError, OverflowError):
+                    sock.close()
+                    continue
+                if err == 0:
+                    results[port] = True
+                    sock.close()
+                elif err in in_progress:
+                    selector.register(sock, selectors.EVENT_WRITE, port)
+                else:
+                    sock.close()
+            
+            deadline = time.monotonic() + timeout
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    sock = key.fileobj
+                    results[key.data] = sock.getsockopt(
+                        socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                    selector.unregister(sock)
+                    sock.close()
+            
+            # Anything still pending timed out
+            for key in list(selector.get_map().values()):
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+    
+    return results
 
 
-def parse_nmap_xml(xml_content: str) -> Dict[str, Any]:
-    """Parse Nmap XML output."""
+@lru_cache(maxsize=1)
+def _xml_backend():
+    """Return the XML module and iterparse options to use, preferring lxml."""
     try:
-        import xml.etree.ElementTree as ET
-        root = ET.fromstring(xml_content)
-        
-        results = {
+        from lxml import etree
+        # Nmap output never needs external entities; keep lxml from fetching
+        # them, and keep libxml2's depth and size limits for untrusted input
+        return etree, {'resolve_entities': False, 'no_network': True}
+    except ImportError:
+        import xml.etree.ElementTree as etree
+        return etree, {}
+
+
+class NmapXMLTarget:
+    """
+    XMLParser target that builds the parse_nmap_xml result from events.
+    
+    Only the elements parse_nmap_xml reports on are looked at, and no
+    Element tree is built. Matching follows ElementTree's find()/findall()
+    on the full tree: per host the first <status>, <hostnames> and <ports>
+    child, every <address> child, and per port the first <state> and
+    <service>; plus the first top-level <scaninfo> and <runstats>.
+    """
+    
+    def __init__(self):
+        self.results = {
             'hosts': [],
             'scan_info': {},
             'run_stats': {}
         }
+        self._depth = 0
+        self._seen = set()  # first-match elements already taken in scope
+        self._host = None
+        self._port = None
+        self._section = None  # 'hostnames', 'ports' or 'runstats'
+    
+    def _first(self, key) -> bool:
+        """Return True the first time key is seen in the current scope."""
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+    
+    def start(self, tag, attrib):
+        self._depth += 1
+        depth = self._depth
         
-        # Parse scan info
-        scaninfo = root.find('scaninfo')
-        if scaninfo is not None:
-            results['scan_info'] = {
-                'type': scaninfo.get('type', ''),
-                'protocol': scaninfo.get('protocol', ''),
-                'numservices': scaninfo.get('numservices', ''),
-                'services': scaninfo.get('services', '')
-            }
-        
-        # Parse hosts
-        for host in root.findall('host'):
-            host_info = {
-                'addresses': [],
-                'hostnames': [],
-                'status': {},
-                'ports': []
-            }
-            
-            # Status
-            status = host.find('status')
-            if status is not None:
-                host_info['status'] = {
-                    'state': status.get('state', ''),
-                    'reason': status.get('reason', '')
+        if depth == 2:
+            # Direct children of <nmaprun>
+            if tag == 'host':
+                self._host = {
+                    'addresses': [],
+                    'hostnames': [],
+                    'status': {},
+                    'ports': []
                 }
-            
-            # Addresses
-            for address in host.findall('address'):
-                host_info['addresses'].append({
-                    'addr': address.get('addr', ''),
-                    'addrtype': address.get('addrtype', '')
-                })
-            
-            # Hostnames
-            hostnames = host.find('hostnames')
-            if hostnames is not None:
-                for hostname in hostnames.findall('hostname'):
-                    host_info['hostnames'].append({
-                        'name': hostname.get('name', ''),
-                        'type': hostname.get('type', '')
+                self.results['hosts'].append(self._host)
+            elif tag == 'scaninfo' and self._first('scaninfo'):
+                self.results['scan_info'] = {
+                    'type': attrib.get('type', ''),
+                    'protocol': attrib.get('protocol', ''),
+                    'numservices': attrib.get('numservices', ''),
+                    'services': attrib.get('services', '')
+                }
+            elif tag == 'runstats' and self._first('runstats'):
+                self._section = 'runstats'
+        
+        elif depth == 3:
+            host = self._host
+            if host is not None:
+                if tag == 'address':
+                    host['addresses'].append({
+                        'addr': attrib.get('addr', ''),
+                        'addrtype': attrib.get('addrtype', '')
                     })
-            
-            # Ports
-            ports = host.find('ports')
-            if ports is not None:
-                for port in ports.findall('port'):
-                    port_info = {
-                        'protocol': port.get('protocol', ''),
-                        'portid': port.get('portid', ''),
-                        'state': {},
-                        'service': {}
+                elif tag == 'status' and self._first('status'):
+                    host['status'] = {
+                        'state': attrib.get('state', ''),
+                        'reason': attrib.get('reason', '')
                     }
-                    
-                    # Port state
-                    state = port.find('state')
-                    if state is not None:
-                        port_info['state'] = {
-                            'state': state.get('state', ''),
-                            'reason': state.get('reason', '')
-                        }
-                    
-                    # Service info
-                    service = port.find('service')
-                    if service is not None:
-                        port_info['service'] = {
-                            'name': service.get('name', ''),
-                            'product': service.get('product', ''),
-                            'version': service.get('version', ''),
-                            'extrainfo': service.get('extrainfo', '')
-                        }
-                    
-                    host_info['ports'].append(port_info)
-            
-            results['hosts'].append(host_info)
+                elif tag in ('hostnames', 'ports') and self._first(tag):
+                    self._section = tag
+            elif self._section == 'runstats' and tag == 'finished' and self._first('finished'):
+                self.results['run_stats'] = {
+                    'time': attrib.get('time', ''),
+                    'timestr': attrib.get('timestr', ''),
+                    'elapsed': attrib.get('elapsed', '')
+                }
         
-        # Parse run stats
-        runstats = root.find('runstats')
-        if runstats is not None:
-            finished = runstats.find('finished')
-            if finished is not None:
-                results['run_stats'] = {
-                    'time': finished.get('time', ''),
-                    'timestr': finished.get('timestr', ''),
-                    'elapsed': finished.get('elapsed', '')
+        elif depth == 4:
+            if self._section == 'hostnames' and tag == 'hostname':
+                self._host['hostnames'].append({
+                    'name': attrib.get('name', ''),
+                    'type': attrib.get('type', '')
+                })
+            elif self._section == 'ports' and tag == 'port':
+                self._port = {
+                    'protocol': attrib.get('protocol', ''),
+                    'portid': attrib.get('portid', ''),
+                    'state': {},
+                    'service': {}
                 }
+                self._host['ports'].append(self._port)
         
-        return results
+        elif depth == 5 and self._port is not None:
+            if tag == 'state' and self._first('state'):
+                self._port['state'] = {
+                    'state': attrib.get('state', ''),
+                    'reason': attrib.get('reason', '')
+                }
+            elif tag == 'service' and self._first('service'):
+                self._port['service'] = {
+                    'name': attrib.get('name', ''),
+                    'product': attrib.get('product', ''),
+                    'version': attrib.get('version', ''),
+                    'extrainfo': attrib.get('extrainfo', '')
+                }
+    
+    def end(self, tag):
+        depth = self._depth
+        self._depth -= 1
+        
+        if depth == 4 and self._port is not None:
+            self._port = None
+            self._seen.difference_update(('state', 'service'))
+        elif depth == 3 and self._section in ('hostnames', 'ports'):
+            self._section = None
+        elif depth == 2:
+            if self._host is not None:
+                self._host = None
+                self._seen.difference_update(('status', 'hostnames', 'ports'))
+            elif self._section == 'runstats':
+                self._section = None
+    
+    def close(self) -> Dict[str, Any]:
+        return self.results
+
+
+def parse_nmap_xml(xml_content: Union[str, bytes]) -> Dict[str, Any]:
+    """
+    Parse Nmap XML output.
+    
+    The document is fed to an XMLParser whose NmapXMLTarget fills the
+    result dict directly from parser events, without building elements.
+    """
+    try:
+        ET, parse_options = _xml_backend()
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        
+        parser = ET.XMLParser(target=NmapXMLTarget(), **parse_options)
+        parser.feed(xml_content)
+        return parser.close()
         
     except Exception as e:
         raise ValueError(f"Could not parse XML content: {e}")
 
 
-def create_backup(file_path: str) -> str:
-    """Create backup of a file."""
+def create_backup(file_path: str, preserve_metadata: bool = True,
+                  hardlink: bool = False) -> str:
+    """
+    Create backup of a file.
+    
+    The data is copied with shutil.copyfile, which uses the kernel's
+    zero-copy paths (sendfile/copy_file_range) where available.
+    
+    Args:
+        file_path: File to back up
+        preserve_metadata: Also copy permissions and timestamps
+        hardlink: Try a hard link before copying. The backup then shares
+            the original's inode, so only use this for files that are
+            replaced rather than modified in place.
+    
+    Returns:
+        Path of the backup file
+    """
     original_path = Path(file_path)
     if not original_path.exists():
         raise FileNotFoundError(f"File {file_path} does not exist")
@@ -318,7 +586,16 @@ def create_backup(file_path: str) -> str:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_path = original_path.with_suffix(f".backup_{timestamp}{original_path.suffix}")
     
+    if hardlink:
+        try:
+            os.link(original_path, backup_path)
+            return str(backup_path)
+        except OSError:
+            pass  # Different filesystem or links unsupported; copy instead
+    
     import shutil
-    shutil.copy2(original_path, backup_path)
+    shutil.copyfile(original_path, backup_path)
+    if preserve_metadata:
+        shutil.copystat(original_path, backup_path)
     
     return str(backup_path)
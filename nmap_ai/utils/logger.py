@@ -3,6 +3,9 @@ Logging utilities for NMAP-AI
 """
 
 import logging
+import logging.handlers
+import multiprocessing
+import os
 import sys
 from pathlib import Path
 from typing import Optional
@@ -11,6 +14,40 @@ from rich.console import Console
 
 from ..config import get_config
 
+_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Rotate nmap-ai.log at 10 MB, keeping five old files
+_LOG_MAX_BYTES = 10 * 1024 * 1024
+_LOG_BACKUP_COUNT = 5
+# Records buffered before the log file is written; ERROR and above flush at once
+_LOG_BUFFER_CAPACITY = 32
+# Buffered records are also written once the oldest is this many seconds old
+_LOG_FLUSH_SECONDS = 1.0
+
+
+class _BufferedLogHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes records older than _LOG_FLUSH_SECONDS."""
+    
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        """Flush when full, on ERROR, or when the oldest record is stale."""
+        return (super().shouldFlush(record)
+                or record.created - self.buffer[0].created >= _LOG_FLUSH_SECONDS)
+
+
+def _log_file_name() -> str:
+    """
+    Get the log file name for this process.
+    
+    Child processes such as uvicorn workers get their own file, so no two
+    processes rotate the same log.
+    
+    Returns:
+        str: Log file name
+    """
+    if multiprocessing.parent_process() is None:
+        return "nmap-ai.log"
+    return f"nmap-ai.{os.getpid()}.log"
+
 
 def setup_logging() -> None:
     """Setup logging configuration."""
@@ -20,13 +57,26 @@ def setup_logging() -> None:
     log_dir = Path.home() / ".nmap-ai" / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
     
+    # Size-bounded log file, written in batches instead of once per record
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_dir / _log_file_name(),
+        maxBytes=_LOG_MAX_BYTES,
+        backupCount=_LOG_BACKUP_COUNT,
+    )
+    file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+    buffered_handler = _BufferedLogHandler(
+        capacity=_LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+    )
+    
     # Configure logging
     logging.basicConfig(
         level=getattr(logging, config.log_level.upper()),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        format=_LOG_FORMAT,
         handlers=[
             RichHandler(console=Console(stderr=True), rich_tracebacks=True),
-            logging.FileHandler(log_dir / "nmap-ai.log"),
+            buffered_handler,
         ]
     )
     
@@ -4,9 +4,56 @@ Input validators for NMAP-AI
 
 import re
 import ipaddress
+from functools import lru_cache
 from typing import Union
 
 
+# Longest DNS name in its textual form
+_MAX_HOSTNAME_LENGTH = 253
+
+_HOSTNAME_RE = re.compile(
+    r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$'
+)
+
+# IP range formats like 192.168.1.1-10
+_RANGE_RE = re.compile(r'^(\d+\.\d+\.\d+\.\d+)-(\d+)$')
+
+_EMAIL_RE = re.compile(
+    r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+)
+
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE
+)
+
+# Dangerous argument patterns to avoid
+_DANGEROUS_PATTERNS = [
+    r'--script.*\.(lua|nse)$',  # Arbitrary script execution
+    r'--datadir',               # Custom data directory
+    r'--resume',                # Resume from file
+    r'-oN\s*/dev/',            # Output to system files
+    r'-oX\s*/dev/',
+    r'-oG\s*/dev/',
+    r'--iflist',               # Interface listing
+    r'--packet-trace',         # Packet tracing (can be verbose)
+    r'--open',                 # Only show open ports (not dangerous but noteworthy)
+]
+
+# Port specs at least this long are validated by the Numba kernel
+_NUMBA_MIN_LENGTH = 256
+
+# Single alternation so one pass over the arguments checks every pattern
+_DANGEROUS_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in _DANGEROUS_PATTERNS),
+    re.IGNORECASE
+)
+
+
 def validate_target(target: str) -> bool:
     """
     Validate if a target is a valid IP address, hostname, or network range.
@@ -22,14 +69,7 @@ def validate_target(target: str) -> bool:
     
     target = target.strip()
     
-    # Check for IP address
-    try:
-        ipaddress.ip_address(target)
-        return True
-    except ValueError:
-        pass
-    
-    # Check for network range
+    # Check for IP address or network range; ip_network accepts both
     try:
         ipaddress.ip_network(target, strict=False)
         return True
@@ -37,21 +77,98 @@ def validate_target(target: str) -> bool:
         pass
     
     # Check for hostname (basic validation)
-    hostname_pattern = re.compile(
-        r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$'
-    )
-    
-    if hostname_pattern.match(target):
+    if len(target) <= _MAX_HOSTNAME_LENGTH and _HOSTNAME_RE.match(target):
         return True
     
     # Check for IP range formats like 192.168.1.1-10
-    range_pattern = re.compile(r'^(\d+\.\d+\.\d+\.\d+)-(\d+)$')
-    if range_pattern.match(target):
+    if _RANGE_RE.match(target):
         return True
     
     return False
 
 
+def _validate_ports_ascii(buf) -> bool:
+    """
+    Validate an ASCII port specification in a single pass.
+    
+    Mirrors the pure-Python rules of validate_ports and is written so
+    that Numba can compile it; ``buf`` is a sequence of byte values.
+    """
+    n = len(buf)
+    i = 0
+    while i <= n:
+        # Find the end of the current comma separated part
+        j = i
+        while j < n and buf[j] != 44:  # ','
+            j += 1
+        
+        # Trim surrounding whitespace like str.strip()
+        start = i
+        end = j
+        while start < end and (9 <= buf[start] <= 13 or 28 <= buf[start] <= 32):
+            start += 1
+        while end > start and (9 <= buf[end - 1] <= 13 or 28 <= buf[end - 1] <= 32):
+            end -= 1
+        
+        if start < end:
+            k = start
+            first = 0
+            digits = 0
+            while k < end and 48 <= buf[k] <= 57:
+                if first <= 65535:
+                    first = first * 10 + (int(buf[k]) - 48)
+                digits += 1
+                k += 1
+            
+            if k == end:
+                if digits == 0 or not (1 <= first <= 65535):
+                    return False
+            else:
+                if digits == 0 or buf[k] != 45:  # '-'
+                    return False
+                k += 1
+                second = 0
+                digits = 0
+                while k < end and 48 <= buf[k] <= 57:
+                    if second <= 65535:
+                        second = second * 10 + (int(buf[k]) - 48)
+                    digits += 1
+                    k += 1
+                if k != end or digits == 0:
+                    return False
+                if not (1 <= first <= 65535 and 1 <= second <= 65535):
+                    return False
+                if first >= second:
+                    return False
+        
+        i = j + 1
+    
+    return True
+
+
+@lru_cache(maxsize=1)
+def _get_ports_kernel():
+    """Compile the port validation kernel with Numba, if installed."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_validate_ports_ascii)
+
+
+def warm_up_ports_kernel() -> None:
+    """
+    Compile the Numba port kernel now instead of on the first bulk spec.
+    
+    Servers call this at startup so a request with a long port list does
+    not wait for the JIT compile while it holds the event loop.
+    """
+    kernel = _get_ports_kernel()
+    if kernel is not None:
+        import numpy as np
+        kernel(np.frombuffer(b'80', dtype=np.uint8))
+
+
 def validate_ports(ports: str) -> bool:
     """
     Validate port specification.
@@ -72,41 +189,37 @@ def validate_ports(ports: str) -> bool:
     if ports.lower() in keywords:
         return True
     
-    # Split by comma and validate each part
-    port_parts = [part.strip() for part in ports.split(',')]
+    # Bulk specs go through the compiled kernel when Numba is available
+    if len(ports) >= _NUMBA_MIN_LENGTH and ports.isascii():
+        kernel = _get_ports_kernel()
+        if kernel is not None:
+            import numpy as np
+            return bool(kernel(np.frombuffer(ports.encode('ascii'), dtype=np.uint8)))
     
-    for part in port_parts:
+    # Split by comma and validate each part
+    for part in ports.split(','):
+        part = part.strip()
         if not part:
             continue
         
         # Check for single port
         if part.isdigit():
-            port_num = int(part)
-            if not (1 <= port_num <= 65535):
+            if not (1 <= int(part) <= 65535):
                 return False
             continue
         
-        # Check for port range
-        if '-' in part:
-            range_parts = part.split('-')
-            if len(range_parts) != 2:
-                return False
-            
-            start_port, end_port = range_parts
-            if not (start_port.isdigit() and end_port.isdigit()):
-                return False
-            
-            start_num, end_num = int(start_port), int(end_port)
-            if not (1 <= start_num <= 65535 and 1 <= end_num <= 65535):
-                return False
-            
-            if start_num >= end_num:
-                return False
-            
-            continue
+        # Check for port range; partition() splits once and a second '-'
+        # leaves end_port non-numeric
+        start_port, is_range, end_port = part.partition('-')
+        if not (is_range and start_port.isdigit() and end_port.isdigit()):
+            return False
         
-        # Invalid format
-        return False
+        start_num, end_num = int(start_port), int(end_port)
+        if not (1 <= start_num <= 65535 and 1 <= end_num <= 65535):
+            return False
+        
+        if start_num >= end_num:
+            return False
     
     return True
 
@@ -124,24 +237,7 @@ def validate_scan_arguments(arguments: str) -> bool:
     if not arguments:
         return True
     
-    # Dangerous argument patterns to avoid
-    dangerous_patterns = [
-        r'--script.*\.(lua|nse)$',  # Arbitrary script execution
-        r'--datadir',               # Custom data directory
-        r'--resume',                # Resume from file
-        r'-oN\s*/dev/',            # Output to system files
-        r'-oX\s*/dev/',
-        r'-oG\s*/dev/',
-        r'--iflist',               # Interface listing
-        r'--packet-trace',         # Packet tracing (can be verbose)
-        r'--open',                 # Only show open ports (not dangerous but noteworthy)
-    ]
-    
-    for pattern in dangerous_patterns:
-        if re.search(pattern, arguments, re.IGNORECASE):
-            return False
-    
-    return True
+    return _DANGEROUS_RE.search(arguments) is None
 
 
 def validate_file_path(file_path: str, must_exist: bool = True) -> bool:
@@ -217,11 +313,7 @@ def validate_email(email: str) -> bool:
     if not email or not isinstance(email, str):
         return False
     
-    email_pattern = re.compile(
-        r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    )
-    
-    return bool(email_pattern.match(email.strip()))
+    return bool(_EMAIL_RE.match(email.strip()))
 
 
 def validate_url(url: str) -> bool:
@@ -237,13 +329,4 @@ def validate_url(url: str) -> bool:
     if not url or not isinstance(url, str):
         return False
     
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE
-    )
-    
-    return bool(url_pattern.match(url.strip()))
+    return bool(_URL_RE.match(url.strip()))
@@ -2,199 +2,460 @@
 API endpoints for NMAP-AI web interface.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
-import uuid
+from fastapi import APIRouter, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Dict, Any, Set, Tuple
+import anyio
+import asyncio
+import secrets
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 
-from ...core.scanner import NmapAIScanner
-from ...ai.smart_scanner import SmartScanner
-from ...ai.vulnerability_detector import VulnerabilityDetector
 from ...config import Config
 from ...utils.logger import get_logger
+from ..responses import ORJSONResponse, render_json
 from .models import (
-    ScanRequest, ScanResponse, ScanStatus, 
-    VulnerabilityReport, ConfigUpdate,
-    ErrorResponse
+    ScanRequest, ScanResponse, ScanStatus, ConfigUpdate,
+    ScanProgress, WebSocketMessage
 )
+from .store import ScanExpired, ScanStore, get_scan_store
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = get_logger("web.api")
 
-# In-memory storage for scan results (in production, use a database)
-active_scans: Dict[str, Dict] = {}
-scan_results: Dict[str, Dict] = {}
+# Fields of a scan record shown by GET /scans
+_SUMMARY_FIELDS = ('scan_id', 'status', 'target', 'started_at', 'progress')
 
+# WebSocket clients following each scan in this process
+_subscribers: Dict[str, Set[WebSocket]] = defaultdict(set)
 
+# Scans waiting for a worker; start_scan answers 429 beyond this
+SCAN_QUEUE_SIZE = 1000
+
+# Most scans run at once in one process. Scans have their own threads,
+# kept below the 40 Starlette shares with sync endpoints and static files
+MAX_CONCURRENT_SCANS = 16
+
+# Threads nmap runs on while a scan is in progress
+_scan_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCANS,
+                                    thread_name_prefix="nmap-ai-scan")
+
+# Queue of pending scans, the event loop its workers run on and the
+# limiter holding running scans to config.max_threads
+_scan_queue: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Queue,
+                            anyio.CapacityLimiter]] = None
+
+# Health probes share one encoded body, rebuilt at most this often
+HEALTH_REFRESH_SECONDS = 1.0
+
+# Monotonic time the cached health body goes stale, and the body
+_health_cache: Tuple[float, bytes] = (0.0, b"")
+
+
+def _progress_message(scan_id: str, scan_info: Dict[str, Any]) -> str:
+    """
+    Encode a scan record as a ScanProgress WebSocket message.
+    
+    Args:
+        scan_id: Unique scan identifier
+        scan_info: Scan record from the store
+    
+    Returns:
+        str: JSON encoded WebSocketMessage
+    """
+    completed = scan_info['status'] == 'completed'
+    progress = ScanProgress(
+        scan_id=scan_id,
+        status=scan_info['status'],
+        progress=100 if completed else scan_info.get('progress', 0),
+        message=scan_info.get('message') or ''
+    )
+    return WebSocketMessage(type='scan_progress', data=progress.model_dump()).model_dump_json()
+
+
+async def _publish(store: ScanStore, scan_id: str):
+    """
+    Send the current state of a scan to the WebSocket clients following it.
+    
+    The message is encoded once and sent to all clients concurrently;
+    clients whose send fails are dropped.
+    
+    Args:
+        store: Scan state store
+        scan_id: Unique scan identifier
+    """
+    subscribed = _subscribers.get(scan_id)
+    if not subscribed:
+        return
+    scan_info = await store.get(scan_id)
+    sockets = list(subscribed)
+    if scan_info is None or not sockets:
+        return
+    
+    message = _progress_message(scan_id, scan_info)
+    results = await asyncio.gather(
+        *(websocket.send_text(message) for websocket in sockets),
+        return_exceptions=True
+    )
+    for websocket, result in zip(sockets, results):
+        if isinstance(result, Exception):
+            subscribed.discard(websocket)
+
+
+async def _update(store: ScanStore, scan_id: str, **fields: Any):
+    """
+    Apply a scan state transition with one store write and one publish.
+    
+    Args:
+        store: Scan state store
+        scan_id: Unique scan identifier
+        **fields: Scan record fields to change
+    """
+    await store.update(scan_id, **fields)
+    await _publish(store, scan_id)
+
+
+def _scan_concurrency(config: Config) -> int:
+    """
+    Get the number of scans allowed to run at once.
+    
+    Args:
+        config: Application configuration
+    
+    Returns:
+        int: config.max_threads capped to MAX_CONCURRENT_SCANS
+    """
+    return max(1, min(config.max_threads or 1, MAX_CONCURRENT_SCANS))
+
+
+async def _scan_worker(queue: asyncio.Queue, running: anyio.CapacityLimiter):
+    """
+    Run queued scans one after another.
+    
+    Args:
+        queue: Queue of execute_scan argument tuples
+        running: Limiter shared by the workers of the queue
+    """
+    while True:
+        scan_id, scan_request, scan_options, config, store = await queue.get()
+        try:
+            # Read per scan so PUT /config changes to max_threads apply
+            running.total_tokens = _scan_concurrency(config)
+            async with running:
+                # Scans cancelled while queued are never started
+                scan_info = await store.get(scan_id)
+                if scan_info is not None and scan_info['status'] != 'cancelled':
+                    await execute_scan(scan_id, scan_request, scan_options, config, store)
+        except Exception as e:
+            logger.error(f"Scan worker failed on scan {scan_id}: {e}")
+        finally:
+            queue.task_done()
+
+
+def _get_scan_queue(config: Config) -> asyncio.Queue:
+    """
+    Get the queue of pending scans, starting its workers on first use.
+    
+    ``MAX_CONCURRENT_SCANS`` workers take scans off the queue, of which
+    at most ``config.max_threads`` run at once. The queue is tied to the
+    running event loop and recreated if the loop changes.
+    
+    Args:
+        config: Application configuration
+    
+    Returns:
+        asyncio.Queue: Queue consumed by the scan workers
+    """
+    global _scan_queue
+    loop = asyncio.get_running_loop()
+    if _scan_queue is None or _scan_queue[0] is not loop:
+        queue = asyncio.Queue(maxsize=SCAN_QUEUE_SIZE)
+        running = anyio.CapacityLimiter(_scan_concurrency(config))
+        for _ in range(MAX_CONCURRENT_SCANS):
+            loop.create_task(_scan_worker(queue, running))
+        _scan_queue = (loop, queue, running)
+    return _scan_queue[1]
+
+
+@lru_cache(maxsize=1)
 def get_config() -> Config:
-    """Get current configuration."""
+    """
+    Get current configuration.
+    
+    One instance is shared by all requests, so updates made through
+    PUT /config are seen by later requests.
+    """
     return Config()
 
 
-@router.post("/scan/start", response_model=ScanResponse)
+def _inline_schema_refs(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve the local $defs references of a model's JSON schema in place."""
+    defs = schema.pop('$defs', {})
+    
+    def resolve(node):
+        if isinstance(node, dict):
+            if '$ref' in node:
+                return resolve(defs[node['$ref'].rsplit('/', 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+    
+    return resolve(schema)
+
+
+async def _scan_request_body(request: Request) -> ScanRequest:
+    """
+    Parse and validate a scan request body in one pass.
+    
+    pydantic-core validates the raw JSON directly instead of FastAPI
+    decoding it to a dict first. Errors are reported like FastAPI's own
+    body validation errors.
+    
+    Args:
+        request: Incoming request
+    
+    Returns:
+        ScanRequest: Validated scan request
+    """
+    body = await request.body()
+    try:
+        return ScanRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [dict(error, loc=('body',) + tuple(error['loc'])) for error in e.errors(include_url=False)],
+            body=body
+        )
+
+
+# Hot endpoints build their JSON themselves and document the model only
+# for OpenAPI, so FastAPI does not validate and re-encode every response
+@router.post(
+    "/scan/start",
+    response_model=None,
+    responses={200: {"model": ScanResponse}},
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {
+            "schema": _inline_schema_refs(ScanRequest.model_json_schema())
+        }}
+    }}
+)
 async def start_scan(
-    scan_request: ScanRequest,
-    background_tasks: BackgroundTasks,
-    config: Config = Depends(get_config)
+    scan_request: ScanRequest = Depends(_scan_request_body),
+    config: Config = Depends(get_config),
+    store: ScanStore = Depends(get_scan_store)
 ):
     """
     Start a new network scan.
     
     Args:
         scan_request: Scan configuration and parameters
-        background_tasks: FastAPI background tasks
         config: Application configuration
-        
+        store: Scan state store
+    
     Returns:
-        ScanResponse: Scan ID and initial status
+        ORJSONResponse: Scan ID and initial status (ScanResponse)
     """
     try:
+        # A full queue means the scanners are saturated; retry later
+        scan_queue = _get_scan_queue(config)
+        if scan_queue.full():
+            raise HTTPException(status_code=429, detail="Too many pending scans")
+        
         # Generate unique scan ID
-        scan_id = str(uuid.uuid4())
+        scan_id = secrets.token_hex(16)
+        
+        # Serialize the options once; the scan worker reuses them
+        scan_options = scan_request.options.model_dump() if scan_request.options else {}
         
-        # Initialize scan status
-        active_scans[scan_id] = {
+        # Initialize scan status; timestamps are stored as ISO strings so
+        # status polls and listings never convert them again
+        await store.put_active(scan_id, {
+            'scan_id': scan_id,
             'status': 'starting',
-            'started_at': datetime.now(),
+            'started_at': datetime.now().isoformat(),
             'progress': 0,
             'target': scan_request.target,
-            'options': scan_request.options.dict() if scan_request.options else {}
-        }
+            'options': scan_options
+        })
         
-        # Start scan in background
-        background_tasks.add_task(
-            execute_scan,
-            scan_id,
-            scan_request,
-            config
-        )
+        # Hand the scan to a worker; the queue may have filled up while
+        # the record was being stored
+        try:
+            scan_queue.put_nowait((scan_id, scan_request, scan_options, config, store))
+        except asyncio.QueueFull:
+            await _update(store, scan_id, status='failed', message='Scan queue is full')
+            raise HTTPException(status_code=429, detail="Too many pending scans")
         
         logger.info(f"Started scan {scan_id} for target {scan_request.target}")
         
-        return ScanResponse(
-            scan_id=scan_id,
-            status="starting",
-            message="Scan started successfully"
-        )
-        
+        return ORJSONResponse({
+            'scan_id': scan_id,
+            'status': 'starting',
+            'message': 'Scan started successfully'
+        })
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to start scan: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/scan/{scan_id}/status", response_model=ScanStatus)
-async def get_scan_status(scan_id: str):
+@router.get("/scan/{scan_id}/status", response_model=None, responses={200: {"model": ScanStatus}})
+async def get_scan_status(scan_id: str, store: ScanStore = Depends(get_scan_store)):
     """
     Get status of an active or completed scan.
     
     Args:
         scan_id: Unique scan identifier
-        
+        store: Scan state store
+    
     Returns:
-        ScanStatus: Current scan status and progress
+        ORJSONResponse: Current scan status and progress (ScanStatus)
     """
-    if scan_id not in active_scans and scan_id not in scan_results:
+    scan_info = await store.get(scan_id)
+    if scan_info is None:
         raise HTTPException(status_code=404, detail="Scan not found")
     
-    if scan_id in active_scans:
-        scan_info = active_scans[scan_id]
-        return ScanStatus(
-            scan_id=scan_id,
-            status=scan_info['status'],
-            progress=scan_info['progress'],
-            started_at=scan_info['started_at'],
-            target=scan_info['target'],
-            message=scan_info.get('message', '')
-        )
+    if scan_info['status'] != 'completed':
+        return ORJSONResponse({
+            'scan_id': scan_id,
+            'status': scan_info['status'],
+            'progress': scan_info['progress'],
+            'started_at': scan_info['started_at'],
+            'completed_at': None,
+            'target': scan_info['target'],
+            'message': scan_info.get('message', '')
+        })
     else:
-        scan_info = scan_results[scan_id]
-        return ScanStatus(
-            scan_id=scan_id,
-            status='completed',
-            progress=100,
-            started_at=scan_info['started_at'],
-            completed_at=scan_info['completed_at'],
-            target=scan_info['target'],
-            message='Scan completed successfully'
-        )
+        return ORJSONResponse({
+            'scan_id': scan_id,
+            'status': 'completed',
+            'progress': 100,
+            'started_at': scan_info['started_at'],
+            'completed_at': scan_info['completed_at'],
+            'target': scan_info['target'],
+            'message': 'Scan completed successfully'
+        })
 
 
 @router.get("/scan/{scan_id}/results")
-async def get_scan_results(scan_id: str):
+async def get_scan_results(scan_id: str, store: ScanStore = Depends(get_scan_store)):
     """
     Get results of a completed scan.
     
     Args:
         scan_id: Unique scan identifier
-        
+        store: Scan state store
+    
     Returns:
         Dict: Scan results
     """
-    if scan_id not in scan_results:
-        if scan_id in active_scans:
+    try:
+        scan_record = await store.get_result(scan_id)
+    except ScanExpired:
+        raise HTTPException(status_code=410, detail="Scan results expired")
+    if scan_record is None:
+        if await store.get(scan_id) is not None:
             raise HTTPException(status_code=400, detail="Scan still in progress")
         else:
             raise HTTPException(status_code=404, detail="Scan not found")
     
-    return scan_results[scan_id]['results']
+    return scan_record['results']
 
 
 @router.delete("/scan/{scan_id}")
-async def cancel_scan(scan_id: str):
+async def cancel_scan(scan_id: str, store: ScanStore = Depends(get_scan_store)):
     """
     Cancel an active scan.
     
     Args:
         scan_id: Unique scan identifier
-        
+        store: Scan state store
+    
     Returns:
         Dict: Cancellation status
     """
-    if scan_id not in active_scans:
+    scan_info = await store.get(scan_id)
+    if scan_info is None or scan_info['status'] == 'completed':
         raise HTTPException(status_code=404, detail="Active scan not found")
     
     # Mark scan as cancelled
-    active_scans[scan_id]['status'] = 'cancelled'
-    active_scans[scan_id]['message'] = 'Scan cancelled by user'
+    await _update(store, scan_id, status='cancelled', message='Scan cancelled by user')
     
     logger.info(f"Cancelled scan {scan_id}")
     
     return {"message": "Scan cancelled successfully"}
 
 
-@router.get("/scans")
-async def list_scans():
+@router.websocket("/ws/scans/{scan_id}")
+async def scan_updates(websocket: WebSocket, scan_id: str,
+                       store: ScanStore = Depends(get_scan_store)):
     """
-    List all scans (active and completed).
+    Stream the progress of a scan to a WebSocket client.
     
-    Returns:
-        Dict: List of all scans with their status
+    The client gets the current state on connect and a ScanProgress
+    message after every state transition.
+    
+    Only transitions of scans run by this process are sent, so with
+    several workers clients should still fall back to polling the status.
+    
+    Args:
+        websocket: Client connection
+        scan_id: Unique scan identifier
+        store: Scan state store
     """
-    scans = []
+    await websocket.accept()
+    scan_info = await store.get(scan_id)
+    if scan_info is None:
+        await websocket.close(code=1008, reason="Scan not found")
+        return
     
-    # Add active scans
-    for scan_id, scan_info in active_scans.items():
-        scans.append({
-            'scan_id': scan_id,
-            'status': scan_info['status'],
-            'target': scan_info['target'],
-            'started_at': scan_info['started_at'],
-            'progress': scan_info['progress']
-        })
+    # Register before sending the current state so no transition is missed
+    sockets = _subscribers[scan_id]
+    sockets.add(websocket)
+    try:
+        await websocket.send_text(_progress_message(scan_id, scan_info))
+        # Clients only listen; reading detects the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sockets.discard(websocket)
+        if not sockets and _subscribers.get(scan_id) is sockets:
+            del _subscribers[scan_id]
+
+
+def _scan_summary(scan_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a stored scan record onto the fields shown in scan listings."""
+    summary = {field: scan_info.get(field) for field in _SUMMARY_FIELDS}
+    if summary['status'] == 'completed':
+        summary['completed_at'] = scan_info.get('completed_at')
+        summary['progress'] = 100
+    return summary
+
+
+@router.get("/scans", response_model=None)
+async def list_scans(store: ScanStore = Depends(get_scan_store)):
+    """
+    List all scans (active and completed).
     
-    # Add completed scans
-    for scan_id, scan_info in scan_results.items():
-        scans.append({
-            'scan_id': scan_id,
-            'status': 'completed',
-            'target': scan_info['target'],
-            'started_at': scan_info['started_at'],
-            'completed_at': scan_info['completed_at'],
-            'progress': 100
-        })
+    Args:
+        store: Scan state store
     
-    return {"scans": scans}
+    Returns:
+        ORJSONResponse: List of all scans with their status
+    """
+    return ORJSONResponse({"scans": [_scan_summary(scan_info) for scan_info in await store.list()]})
 
 
 @router.post("/vulnerability/analyze")
@@ -208,41 +469,20 @@ async def analyze_vulnerabilities(
     Args:
         scan_results_data: Scan results to analyze
         config: Application configuration
-        
+    
     Returns:
-        Dict: Vulnerability analysis report
+        ORJSONResponse: Vulnerability analysis report
     """
     try:
-        detector = VulnerabilityDetector(config)
-        vuln_report = detector.analyze_scan_results(scan_results_data)
+        # Imported on first use so the other endpoints never load it
+        from ...ai.vulnerability_detector import VulnerabilityDetector
         
-        return {
-            'target_ip': vuln_report.target_ip,
-            'scan_time': vuln_report.scan_time.isoformat(),
-            'total_vulnerabilities': vuln_report.total_vulnerabilities,
-            'severity_counts': {
-                'critical': vuln_report.critical_count,
-                'high': vuln_report.high_count,
-                'medium': vuln_report.medium_count,
-                'low': vuln_report.low_count
-            },
-            'risk_score': vuln_report.risk_score,
-            'vulnerabilities': [
-                {
-                    'cve_id': v.cve_id,
-                    'severity': v.severity,
-                    'score': v.score,
-                    'description': v.description,
-                    'affected_service': v.affected_service,
-                    'port': v.port,
-                    'exploit_available': v.exploit_available,
-                    'patch_available': v.patch_available
-                }
-                for v in vuln_report.vulnerabilities
-            ],
-            'recommendations': vuln_report.recommendations
-        }
+        # Both steps block (database setup and analysis); keep them off the loop
+        detector = await run_in_threadpool(VulnerabilityDetector, config)
+        vuln_report = await run_in_threadpool(detector.analyze_scan_results, scan_results_data)
         
+        return ORJSONResponse(vuln_report.api_dict())
+    
     except Exception as e:
         logger.error(f"Vulnerability analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -285,7 +525,7 @@ async def update_configuration(
     Args:
         config_update: Configuration updates
         config: Current configuration
-        
+    
     Returns:
         Dict: Updated configuration
     """
@@ -306,85 +546,97 @@ async def update_configuration(
         logger.info("Configuration updated successfully")
         
         return {"message": "Configuration updated successfully"}
-        
+    
     except Exception as e:
         logger.error(f"Failed to update configuration: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _health_body() -> bytes:
+    """Get the encoded health status, rebuilding it once it is stale."""
+    global _health_cache
+    now = time.monotonic()
+    if now >= _health_cache[0]:
+        body = render_json({
+            'status': 'healthy',
+            'timestamp': datetime.now().isoformat(),
+            'version': '1.0.0',
+            'services': {
+                'scanner': 'available',
+                'ai_engine': 'available',
+                'vulnerability_detector': 'available'
+            }
+        })
+        _health_cache = (now + HEALTH_REFRESH_SECONDS, body)
+    return _health_cache[1]
+
+
 @router.get("/health")
 async def health_check():
     """
     Health check endpoint.
     
+    Load balancers poll this often, so the body is encoded at most once
+    per HEALTH_REFRESH_SECONDS and its timestamp may be that old.
+    
     Returns:
-        Dict: Service health status
+        Response: Service health status as JSON
     """
-    return {
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'version': '1.0.0',
-        'services': {
-            'scanner': 'available',
-            'ai_engine': 'available',
-            'vulnerability_detector': 'available'
-        }
-    }
+    return Response(content=_health_body(), media_type="application/json")
 
 
-async def execute_scan(scan_id: str, scan_request: ScanRequest, config: Config):
+async def execute_scan(scan_id: str, scan_request: ScanRequest,
+                       scan_options: Dict[str, Any], config: Config, store: ScanStore):
     """
-    Execute scan in background task.
+    Execute a scan on behalf of a scan worker.
     
     Args:
         scan_id: Unique scan identifier
         scan_request: Scan parameters
+        scan_options: Scan options already serialized by start_scan
         config: Application configuration
+        store: Scan state store
     """
+    started_ns = time.monotonic_ns()
     try:
         # Update status
-        active_scans[scan_id]['status'] = 'running'
-        active_scans[scan_id]['progress'] = 10
+        await _update(store, scan_id, status='running', progress=10)
         
-        # Initialize scanner
+        # Initialize scanner; imported here so that workers which never
+        # scan do not load the scanner and AI modules
         if scan_request.ai_scan:
-            scanner = SmartScanner(config)
+            from ...ai.smart_scanner import SmartScanner
+            scan = partial(SmartScanner().smart_scan, scan_request.target)
         else:
-            scanner = NmapAIScanner(config)
-        
-        active_scans[scan_id]['progress'] = 20
+            from ...core.scanner import NmapAIScanner
+            scanner = NmapAIScanner(ai_enabled=False)
+            scan = partial(scanner.scan, scan_request.target, **scan_options)
         
-        # Prepare scan options
-        scan_options = {}
-        if scan_request.options:
-            scan_options.update(scan_request.options.dict())
+        await _update(store, scan_id, progress=30)
         
-        active_scans[scan_id]['progress'] = 30
+        # Execute scan on a scan thread so the event loop keeps serving
+        # status and list requests while nmap runs
+        results = await asyncio.get_running_loop().run_in_executor(_scan_executor, scan)
         
-        # Execute scan
-        results = scanner.scan(scan_request.target, **scan_options)
+        await _update(store, scan_id, progress=80)
         
-        active_scans[scan_id]['progress'] = 80
-        
-        # Store results
-        scan_results[scan_id] = {
+        # Store results; this also removes the scan from the active set
+        elapsed_time = (time.monotonic_ns() - started_ns) / 1e9
+        scan_info = await store.get(scan_id)
+        await store.put_result(scan_id, {
             'scan_id': scan_id,
             'target': scan_request.target,
-            'started_at': active_scans[scan_id]['started_at'],
-            'completed_at': datetime.now(),
+            'started_at': scan_info['started_at'],
+            'completed_at': datetime.now().isoformat(),
+            'elapsed_time': elapsed_time,
             'results': results
-        }
-        
-        # Remove from active scans
-        del active_scans[scan_id]
-        
-        logger.info(f"Completed scan {scan_id}")
+        })
+        await _publish(store, scan_id)
         
+        logger.info(f"Completed scan {scan_id} in {elapsed_time:.1f}s")
+    
     except Exception as e:
         logger.error(f"Scan {scan_id} failed: {e}")
         
         # Update status to failed
-        if scan_id in active_scans:
-            active_scans[scan_id]['status'] = 'failed'
-            active_scans[scan_id]['message'] = str(e)
-            active_scans[scan_id]['progress'] = 0
+        await _update(store, scan_id, status='failed', message=str(e), progress=0)
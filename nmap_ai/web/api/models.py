@@ -2,10 +2,16 @@
 Pydantic models for NMAP-AI web API.
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List, Dict, Any, Union, Literal
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+
+from ...utils.validators import validate_target as is_valid_target, validate_ports
+
+# Clients resend the same few port specifications, so their checks are cached
+_is_valid_ports = lru_cache(maxsize=256)(validate_ports)
 
 
 class ScanType(str, Enum):
@@ -35,11 +41,20 @@ class OutputFormat(str, Enum):
     HTML = "html"
 
 
+# Field types for the enums above; pydantic checks literals without
+# creating enum members, and values stay plain strings
+ScanTypeName = Literal["syn", "tcp", "udp", "ack", "connect"]
+TimingTemplateName = Literal["T0", "T1", "T2", "T3", "T4", "T5"]
+OutputFormatName = Literal["json", "xml", "csv", "html"]
+
+
 class ScanOptions(BaseModel):
     """Scan configuration options."""
+    model_config = ConfigDict(extra='forbid', frozen=True)
+    
     ports: Optional[str] = Field(default="1-1000", description="Port range to scan")
-    scan_type: Optional[ScanType] = Field(default=ScanType.SYN, description="Scan technique")
-    timing: Optional[TimingTemplate] = Field(default=TimingTemplate.T3, description="Timing template")
+    scan_type: Optional[ScanTypeName] = Field(default="syn", description="Scan technique")
+    timing: Optional[TimingTemplateName] = Field(default="T3", description="Timing template")
     timeout: Optional[int] = Field(default=300, ge=1, le=3600, description="Scan timeout in seconds")
     threads: Optional[int] = Field(default=None, ge=1, le=100, description="Number of parallel threads")
     service_detection: Optional[bool] = Field(default=True, description="Enable service detection")
@@ -54,26 +69,45 @@ class ScanOptions(BaseModel):
     source_port: Optional[int] = Field(default=None, description="Source port number")
     max_rate: Optional[int] = Field(default=None, description="Maximum packet rate")
     min_rate: Optional[int] = Field(default=None, description="Minimum packet rate")
+    
+    @field_validator('ports')
+    @classmethod
+    def validate_ports(cls, v):
+        """Reject port specifications the scanner would refuse, before queuing."""
+        if v is None:
+            return v
+        v = v.strip()
+        if not _is_valid_ports(v):
+            raise ValueError(f"Invalid port specification: {v}")
+        return v
 
 
 class ScanRequest(BaseModel):
     """Request model for starting a scan."""
+    model_config = ConfigDict(extra='forbid', frozen=True)
+    
     target: str = Field(..., description="Target IP, hostname, or CIDR range")
     ai_scan: Optional[bool] = Field(default=False, description="Use AI-powered scanning")
     vuln_scan: Optional[bool] = Field(default=False, description="Enable vulnerability detection")
     options: Optional[ScanOptions] = Field(default=None, description="Scan options")
     
-    @validator('target')
+    @field_validator('target')
+    @classmethod
     def validate_target(cls, v):
-        """Validate target format."""
+        """Validate that target is an IP address, network, range or hostname."""
         if not v or not v.strip():
             raise ValueError("Target cannot be empty")
-        return v.strip()
+        v = v.strip()
+        if not is_valid_target(v):
+            raise ValueError(f"Invalid target: {v}")
+        return v
 
 
 class ScanResponse(BaseModel):
     """Response model for scan start."""
-    scan_id: str = Field(..., description="Unique scan identifier")
+    model_config = ConfigDict(frozen=True)
+    
+    scan_id: str = Field(..., description="32-char hex scan identifier")
     status: str = Field(..., description="Initial scan status")
     message: str = Field(..., description="Status message")
 
@@ -91,6 +125,8 @@ class ScanStatus(BaseModel):
 
 class PortInfo(BaseModel):
     """Information about a scanned port."""
+    model_config = ConfigDict(frozen=True)
+    
     port: int = Field(..., description="Port number")
     protocol: str = Field(..., description="Protocol (tcp/udp)")
     state: str = Field(..., description="Port state")
@@ -102,6 +138,8 @@ class PortInfo(BaseModel):
 
 class HostInfo(BaseModel):
     """Information about a scanned host."""
+    model_config = ConfigDict(frozen=True)
+    
     ip: str = Field(..., description="IP address")
     hostname: Optional[str] = Field(default=None, description="Hostname")
     status: str = Field(..., description="Host status")
@@ -162,7 +200,7 @@ class ConfigAISettings(BaseModel):
 
 class ConfigOutputSettings(BaseModel):
     """Output configuration settings."""
-    default_format: Optional[OutputFormat] = Field(default=None)
+    default_format: Optional[OutputFormatName] = Field(default=None)
     results_directory: Optional[str] = Field(default=None)
 
 
@@ -192,7 +230,7 @@ class HealthStatus(BaseModel):
 class ReportRequest(BaseModel):
     """Report generation request."""
     scan_id: str = Field(..., description="Scan ID to generate report for")
-    format: OutputFormat = Field(default=OutputFormat.HTML, description="Report format")
+    format: OutputFormatName = Field(default="html", description="Report format")
     include_raw_results: Optional[bool] = Field(default=False, description="Include raw scan data")
     include_vulnerability_analysis: Optional[bool] = Field(default=True, description="Include vulnerability analysis")
 
@@ -200,7 +238,7 @@ class ReportRequest(BaseModel):
 class ReportResponse(BaseModel):
     """Report generation response."""
     report_id: str = Field(..., description="Generated report ID")
-    format: OutputFormat = Field(..., description="Report format")
+    format: OutputFormatName = Field(..., description="Report format")
     download_url: str = Field(..., description="Report download URL")
     generated_at: datetime = Field(..., description="Report generation time")
     expires_at: datetime = Field(..., description="Report expiration time")
@@ -0,0 +1,299 @@
+"""
+Scan state storage for the NMAP-AI web API.
+
+The API keeps one record per scan (status, progress, target, timestamps)
+plus the results of completed scans. ``MemoryScanStore`` holds them in the
+current process; ``RedisScanStore`` keeps them in Redis so that every
+uvicorn worker sees the same scans and old entries expire.
+"""
+
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from ...utils.logger import get_logger
+
+logger = get_logger("web.store")
+
+# Completed and abandoned scans are dropped after this long
+DEFAULT_SCAN_TTL = 24 * 60 * 60
+
+# Completed scans whose results the in-memory store keeps at most
+DEFAULT_MAX_RESULTS = 1024
+
+
+class ScanExpired(KeyError):
+    """Raised by ``get_result`` when a scan's results have been dropped."""
+
+
+class ScanStore(ABC):
+    """
+    Storage interface for scan state.
+    
+    A scan record is a dict with at least ``status``, ``progress``,
+    ``target`` and ``started_at``. Completed scans have ``status`` set to
+    'completed', a ``completed_at`` timestamp and their results stored
+    separately so status polls never load them.
+    """
+    
+    @abstractmethod
+    async def put_active(self, scan_id: str, info: Dict[str, Any]) -> None:
+        """Create or replace the record of a scan that is not finished."""
+    
+    @abstractmethod
+    async def update(self, scan_id: str, **fields: Any) -> None:
+        """Update individual fields of an existing scan record."""
+    
+    @abstractmethod
+    async def put_result(self, scan_id: str, record: Dict[str, Any]) -> None:
+        """Store a completed scan; ``record['results']`` holds the results."""
+    
+    @abstractmethod
+    async def get(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        """Return the scan record without results, or None if unknown."""
+    
+    @abstractmethod
+    async def get_result(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the completed scan record including results, or None.
+        
+        Raises ScanExpired for scans the store knows it has dropped.
+        """
+    
+    @abstractmethod
+    async def list(self) -> List[Dict[str, Any]]:
+        """Return the records of all known scans, without results."""
+
+
+class MemoryScanStore(ScanStore):
+    """
+    Process-local scan store; state is lost on restart and not shared.
+    
+    Scans are dropped ``ttl`` seconds after their last write, and once more
+    than ``max_results`` completed scans are held the oldest are dropped so
+    a long-running API cannot grow without bound. The IDs of recently
+    dropped scans are remembered so their lookups can report expiry.
+    
+    Only the event loop thread touches the store and no method awaits
+    between reading and writing, so every call is atomic without locks.
+    Callers running work in threads must hand updates back to the loop.
+    """
+    
+    def __init__(self, ttl: float = DEFAULT_SCAN_TTL, max_results: int = DEFAULT_MAX_RESULTS):
+        self.ttl = ttl
+        self.max_results = max_results
+        # One record per scan, in start order; results are kept apart so
+        # records can be listed as they are
+        self.scans: Dict[str, Dict[str, Any]] = {}
+        # Results in completion order, deadlines in last-write order
+        self.results: "OrderedDict[str, Any]" = OrderedDict()
+        self._deadlines: "OrderedDict[str, float]" = OrderedDict()
+        self._expired: "OrderedDict[str, None]" = OrderedDict()
+    
+    def _touch(self, scan_id: str) -> None:
+        self._deadlines[scan_id] = time.monotonic() + self.ttl
+        self._deadlines.move_to_end(scan_id)
+    
+    def _drop(self, scan_id: str) -> None:
+        self.scans.pop(scan_id, None)
+        self.results.pop(scan_id, None)
+        self._deadlines.pop(scan_id, None)
+        self._expired[scan_id] = None
+        if len(self._expired) > self.max_results:
+            self._expired.popitem(last=False)
+    
+    def _prune(self) -> None:
+        # Deadlines are ordered, so only expired scans are visited
+        now = time.monotonic()
+        while self._deadlines:
+            scan_id, deadline = next(iter(self._deadlines.items()))
+            if deadline > now:
+                break
+            self._drop(scan_id)
+    
+    async def put_active(self, scan_id: str, info: Dict[str, Any]) -> None:
+        self._prune()
+        self.scans[scan_id] = info
+        self._expired.pop(scan_id, None)
+        self._touch(scan_id)
+    
+    async def update(self, scan_id: str, **fields: Any) -> None:
+        self._prune()
+        info = self.scans.get(scan_id)
+        if info is not None:
+            info.update(fields)
+            self._touch(scan_id)
+    
+    async def put_result(self, scan_id: str, record: Dict[str, Any]) -> None:
+        self._prune()
+        info = {key: value for key, value in record.items() if key != 'results'}
+        info['status'] = 'completed'
+        self.results[scan_id] = record.get('results')
+        self.results.move_to_end(scan_id)
+        self.scans[scan_id] = info
+        self._expired.pop(scan_id, None)
+        self._touch(scan_id)
+        while len(self.results) > self.max_results:
+            self._drop(next(iter(self.results)))
+    
+    async def get(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        self._prune()
+        return self.scans.get(scan_id)
+    
+    async def get_result(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        self._prune()
+        if scan_id in self._expired:
+            raise ScanExpired(scan_id)
+        info = self.scans.get(scan_id)
+        if info is None or info['status'] != 'completed':
+            return None
+        return dict(info, results=self.results.get(scan_id))
+    
+    async def list(self) -> List[Dict[str, Any]]:
+        self._prune()
+        return list(self.scans.values())
+
+
+def _json_default(value: Any) -> Any:
+    """Encode datetimes the way FastAPI renders them in responses."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+class RedisScanStore(ScanStore):
+    """
+    Scan store backed by Redis, shared by all API workers.
+    
+    Each scan is a hash ``<prefix>:scan:<id>`` whose fields are JSON
+    encoded, results live in ``<prefix>:scan:<id>:results`` and the set
+    ``<prefix>:scans`` indexes the known scan IDs. All keys expire after
+    ``ttl`` seconds; index entries of expired scans are pruned on listing.
+    Timestamps are stored as ISO 8601 strings.
+    """
+    
+    def __init__(self, client, ttl: int = DEFAULT_SCAN_TTL, prefix: str = "nmap-ai"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.index_key = f"{prefix}:scans"
+    
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisScanStore":
+        """Create a store from a redis:// URL."""
+        import redis.asyncio as aioredis
+        return cls(aioredis.from_url(url), **kwargs)
+    
+    def _key(self, scan_id: str) -> str:
+        return f"{self.prefix}:scan:{scan_id}"
+    
+    async def _write(self, scan_id: str, fields: Dict[str, Any],
+                     replace: bool = False, results: Optional[str] = None) -> None:
+        key = self._key(scan_id)
+        mapping = {name: _dumps(value) for name, value in fields.items()}
+        async with self.client.pipeline(transaction=True) as pipe:
+            if replace:
+                pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.ttl)
+            if results is not None:
+                pipe.set(f"{key}:results", results, ex=self.ttl)
+            pipe.sadd(self.index_key, scan_id)
+            await pipe.execute()
+    
+    async def put_active(self, scan_id: str, info: Dict[str, Any]) -> None:
+        await self._write(scan_id, info, replace=True)
+    
+    async def update(self, scan_id: str, **fields: Any) -> None:
+        # Only touch scans that still exist so late updates cannot recreate
+        # an expired record without its target and start time
+        if fields and await self.client.exists(self._key(scan_id)):
+            await self._write(scan_id, fields)
+    
+    async def put_result(self, scan_id: str, record: Dict[str, Any]) -> None:
+        fields = {key: value for key, value in record.items() if key != 'results'}
+        fields['status'] = 'completed'
+        await self._write(scan_id, fields, replace=True,
+                          results=_dumps(record.get('results')))
+    
+    @staticmethod
+    def _decode(raw: Dict[bytes, bytes]) -> Dict[str, Any]:
+        return {
+            (name.decode() if isinstance(name, bytes) else name): json.loads(value)
+            for name, value in raw.items()
+        }
+    
+    async def get(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.hgetall(self._key(scan_id))
+        return self._decode(raw) if raw else None
+    
+    async def get_result(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        key = self._key(scan_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.get(f"{key}:results")
+            raw, results = await pipe.execute()
+        if not raw:
+            # Still indexed means the scan existed until its keys expired
+            if await self.client.sismember(self.index_key, scan_id):
+                raise ScanExpired(scan_id)
+            return None
+        if results is None:
+            return None
+        record = self._decode(raw)
+        if record.get('status') != 'completed':
+            return None
+        record['results'] = json.loads(results)
+        return record
+    
+    async def list(self) -> List[Dict[str, Any]]:
+        scan_ids = [
+            scan_id.decode() if isinstance(scan_id, bytes) else scan_id
+            for scan_id in await self.client.smembers(self.index_key)
+        ]
+        if not scan_ids:
+            return []
+        
+        # One round trip for all records
+        async with self.client.pipeline(transaction=False) as pipe:
+            for scan_id in scan_ids:
+                pipe.hgetall(self._key(scan_id))
+            records = await pipe.execute()
+        
+        scans = []
+        expired = []
+        for scan_id, raw in zip(scan_ids, records):
+            if raw:
+                scans.append(self._decode(raw))
+            else:
+                expired.append(scan_id)
+        if expired:
+            await self.client.srem(self.index_key, *expired)
+        return scans
+
+
+@lru_cache(maxsize=1)
+def get_scan_store() -> ScanStore:
+    """
+    Get the scan store shared by the API endpoints.
+    
+    Uses Redis when ``NMAP_AI_REDIS_URL`` is set (required when running
+    several uvicorn workers), otherwise an in-process store.
+    
+    Returns:
+        ScanStore: The configured store
+    """
+    url = os.environ.get("NMAP_AI_REDIS_URL")
+    if url:
+        logger.info("Using Redis scan store")
+        return RedisScanStore.from_url(url)
+    return MemoryScanStore()
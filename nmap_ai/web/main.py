@@ -4,9 +4,189 @@ Web interface main module for NMAP-AI
 
 import sys
 import os
-from typing import Optional
+import importlib.util
+import zlib
+from typing import Dict, Optional
 
-def web_main(port: int = 8080, host: str = "localhost", args: Optional[list] = None) -> None:
+# Landing page served when the index.html template is unavailable
+_ROOT_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <title>NMAP-AI Web Interface</title>
+    <link rel="icon" type="image/png" href="/static/nmap-ai.png">
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }
+        .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .logo { text-align: center; margin-bottom: 20px; }
+        .logo img { width: 64px; height: 64px; }
+        h1 { color: #2c3e50; text-align: center; margin-top: 10px; }
+        .status { background: #e8f4fd; padding: 15px; border-radius: 5px; margin: 20px 0; }
+        .api-info { background: #f0f0f0; padding: 15px; border-radius: 5px; margin: 20px 0; font-family: monospace; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="logo">
+            <img src="/static/nmap-ai.png" alt="NMAP-AI Logo">
+        </div>
+        <h1>🚀 NMAP-AI Web Interface</h1>
+        <div class="status">
+            <strong>Status:</strong> Web interface is under development.<br>
+            Please use the CLI interface for now.
+        </div>
+        <div class="api-info">
+            <strong>API Endpoints:</strong><br>
+            • GET /docs - API documentation<br>
+            • GET /health - Health check<br>
+            • POST /api/scan/start - Start scan<br>
+            • GET /api/scan/{scan_id}/results - Get results
+        </div>
+        <p><strong>CLI Usage:</strong></p>
+        <div class="api-info">
+            nmap-ai scan 192.168.1.1 --ai-mode smart<br>
+            nmap-ai generate-script example.com --vulnerability web<br>
+            nmap-ai smart-scan 10.0.0.1 --profile adaptive
+        </div>
+    </div>
+</body>
+</html>
+"""
+_ROOT_HTML_BYTES = _ROOT_HTML.encode("utf-8")
+# The tag uses zlib (already loaded at startup) rather than hashlib and
+# OpenSSL, keeping this module cheap to import
+_ROOT_HTML_ETAG = '"%08x"' % zlib.crc32(_ROOT_HTML_BYTES)
+# Weak, since the gzip middleware may serve the page in another encoding
+_ROOT_HTML_HEADERS = {"ETag": f"W/{_ROOT_HTML_ETAG}", "Cache-Control": "public, max-age=3600"}
+
+# The health and API status never change, so they are written out pre-encoded
+_HEALTH_BYTES = b'{"status":"healthy","service":"nmap-ai-web","version":"1.0.0"}'
+_API_STATUS_BYTES = (
+    b'{"service":"NMAP-AI API","version":"1.0.0","status":"development",'
+    b'"features":{"scanning":"planned","ai_script_generation":"planned",'
+    b'"result_analysis":"planned","web_dashboard":"in_development"}}'
+)
+
+
+def _server_implementations() -> Dict[str, str]:
+    """
+    Pick uvicorn's event loop and HTTP parser.
+    
+    uvloop and httptools (installed by the web extra through
+    uvicorn[standard]) are used when importable; otherwise uvicorn falls
+    back to asyncio and h11, e.g. on Windows where uvloop is unavailable.
+    
+    Returns:
+        Dict: ``loop`` and ``http`` arguments for uvicorn.run
+    """
+    return {
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+    }
+
+
+def _build_app():
+    """
+    Build the FastAPI application for the web interface.
+    
+    Called on first access to ``app`` (once in every uvicorn worker), so
+    the web dependencies are only imported when an app is needed.
+    
+    Returns:
+        FastAPI: The configured application
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.gzip import GZipMiddleware
+    from fastapi.templating import Jinja2Templates
+    from fastapi.responses import HTMLResponse, Response
+    from ..utils.validators import warm_up_ports_kernel
+    from .api import router
+    from .responses import ORJSONResponse, etag_matches
+    from .staticfiles import CachedStaticFiles
+    
+    # Create FastAPI application
+    app = FastAPI(
+        title="NMAP-AI Web Interface",
+        description="AI-Powered Network Scanning & Automation",
+        version="1.0.0",
+        default_response_class=ORJSONResponse
+    )
+    
+    # JSON and HTML compress several times over; tiny bodies are not worth it
+    app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+    
+    # Get the current directory
+    current_dir = os.path.dirname(__file__)
+    static_dir = os.path.join(current_dir, "static")
+    templates_dir = os.path.join(current_dir, "templates")
+    
+    # Mount static files
+    if os.path.exists(static_dir):
+        app.mount("/static", CachedStaticFiles(directory=static_dir), name="static")
+    
+    # Setup templates; checked once here rather than on every request
+    use_templates = os.path.isdir(templates_dir)
+    index_template = None
+    if use_templates:
+        templates = Jinja2Templates(directory=templates_dir)
+        # Templates ship with the package, so never re-stat them
+        templates.env.auto_reload = False
+        try:
+            index_template = templates.get_template("index.html")
+        except Exception:
+            index_template = None
+    
+    # Basic routes
+    @app.get("/", response_class=HTMLResponse)
+    async def root(request: Request):
+        # If templates exist, use them, otherwise fall back to inline HTML
+        if index_template is not None:
+            try:
+                return HTMLResponse(index_template.render(request=request))
+            except:
+                pass
+        
+        # Inline fallback page, encoded once at import
+        if etag_matches(request.headers.get("if-none-match"), _ROOT_HTML_ETAG):
+            return Response(status_code=304, headers=_ROOT_HTML_HEADERS)
+        return Response(content=_ROOT_HTML_BYTES, media_type="text/html",
+                        headers=_ROOT_HTML_HEADERS)
+    
+    @app.get("/health")
+    async def health_check():
+        return Response(content=_HEALTH_BYTES, media_type="application/json")
+    
+    @app.get("/api/v1/status")
+    async def api_status():
+        return Response(content=_API_STATUS_BYTES, media_type="application/json")
+    
+    # Scan, results, configuration and vulnerability API
+    app.include_router(router, prefix="/api")
+    
+    # Port specs in scan requests may hit the Numba kernel; compile it
+    # before serving rather than inside the first such request
+    warm_up_ports_kernel()
+    
+    return app
+
+
+def __getattr__(name: str):
+    """
+    Build the module-level ``app`` on first access.
+    
+    ``from nmap_ai.web.main import app`` (tests, uvicorn's
+    ``nmap_ai.web.main:app``) gets a ready application, while commands
+    that only import web_main never load FastAPI.
+    """
+    if name == "app":
+        app = _build_app()
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def web_main(port: int = 8080, host: str = "localhost", args: Optional[list] = None,
+             workers: Optional[int] = None, verbose: bool = False) -> None:
     """
     Main entry point for web application.
     
@@ -14,129 +194,45 @@ def web_main(port: int = 8080, host: str = "localhost", args: Optional[list] = N
         port: Port to run web server on
         host: Host to bind to
         args: Command line arguments (optional)
+        workers: Number of server processes; defaults to the CPU count,
+            at most 4, when NMAP_AI_REDIS_URL is set and to 1 otherwise
+        verbose: Log at info level and log every request
     """
     try:
         # Try to import web dependencies
         try:
-            from fastapi import FastAPI, HTTPException, Request
-            from fastapi.staticfiles import StaticFiles
-            from fastapi.templating import Jinja2Templates
-            from fastapi.responses import HTMLResponse
+            import fastapi
             import uvicorn
         except ImportError:
             print("Web dependencies not installed. Please install with: pip install nmap-ai[web]")
             sys.exit(1)
         
-        # Create FastAPI application
-        app = FastAPI(
-            title="NMAP-AI Web Interface",
-            description="AI-Powered Network Scanning & Automation",
-            version="1.0.0"
-        )
-        
-        # Get the current directory
-        current_dir = os.path.dirname(__file__)
-        static_dir = os.path.join(current_dir, "static")
-        templates_dir = os.path.join(current_dir, "templates")
-        
-        # Mount static files
-        if os.path.exists(static_dir):
-            app.mount("/static", StaticFiles(directory=static_dir), name="static")
-        
-        # Setup templates
-        if os.path.exists(templates_dir):
-            templates = Jinja2Templates(directory=templates_dir)
-        
-        # Basic routes
-        @app.get("/", response_class=HTMLResponse)
-        async def root(request: Request):
-            # If templates exist, use them, otherwise fall back to inline HTML
-            if os.path.exists(templates_dir):
-                try:
-                    return templates.TemplateResponse("index.html", {"request": request})
-                except:
-                    pass
-            
-            return """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>NMAP-AI Web Interface</title>
-                <link rel="icon" type="image/png" href="/static/nmap-ai.png">
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }
-                    .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-                    .logo { text-align: center; margin-bottom: 20px; }
-                    .logo img { width: 64px; height: 64px; }
-                    h1 { color: #2c3e50; text-align: center; margin-top: 10px; }
-                    .status { background: #e8f4fd; padding: 15px; border-radius: 5px; margin: 20px 0; }
-                    .api-info { background: #f0f0f0; padding: 15px; border-radius: 5px; margin: 20px 0; font-family: monospace; }
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="logo">
-                        <img src="/static/nmap-ai.png" alt="NMAP-AI Logo">
-                    </div>
-                    <h1>🚀 NMAP-AI Web Interface</h1>
-                    <div class="status">
-                        <strong>Status:</strong> Web interface is under development.<br>
-                        Please use the CLI interface for now.
-                    </div>
-                    <div class="api-info">
-                        <strong>API Endpoints:</strong><br>
-                        • GET /docs - API documentation<br>
-                        • GET /health - Health check<br>
-                        • POST /api/v1/scan - Start scan (coming soon)<br>
-                        • GET /api/v1/results - Get results (coming soon)
-                    </div>
-                    <p><strong>CLI Usage:</strong></p>
-                    <div class="api-info">
-                        nmap-ai scan 192.168.1.1 --ai-mode smart<br>
-                        nmap-ai generate-script example.com --vulnerability web<br>
-                        nmap-ai smart-scan 10.0.0.1 --profile adaptive
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-        
-        @app.get("/health")
-        async def health_check():
-            return {"status": "healthy", "service": "nmap-ai-web", "version": "1.0.0"}
-        
-        @app.get("/api/v1/status")
-        async def api_status():
-            return {
-                "service": "NMAP-AI API",
-                "version": "1.0.0",
-                "status": "development",
-                "features": {
-                    "scanning": "planned",
-                    "ai_script_generation": "planned",
-                    "result_analysis": "planned",
-                    "web_dashboard": "in_development"
-                }
-            }
-        
-        # Placeholder API endpoints
-        @app.post("/api/v1/scan")
-        async def start_scan():
-            raise HTTPException(status_code=501, detail="Scan API endpoint not yet implemented")
-        
-        @app.get("/api/v1/results/{scan_id}")
-        async def get_results(scan_id: str):
-            raise HTTPException(status_code=501, detail="Results API endpoint not yet implemented")
+        # Without Redis each worker keeps its own scans, so a status poll
+        # answered by another worker would not find the scan
+        shared_store = bool(os.environ.get("NMAP_AI_REDIS_URL"))
+        if workers is None:
+            workers = min(os.cpu_count() or 1, 4) if shared_store else 1
+        elif workers > 1 and not shared_store:
+            print("⚠️  Scans are kept per worker; set NMAP_AI_REDIS_URL to share them")
         
         # Print startup message
         print("🚀 Starting NMAP-AI Web Interface...")
         print(f"🌐 Access the web interface at: http://{host}:{port}")
         print(f"📖 API documentation at: http://{host}:{port}/docs")
+        print(f"⚙️  Running {workers} worker process{'es' if workers > 1 else ''}")
         print("⚡ Use Ctrl+C to stop the server")
         
-        # Run the web server
-        uvicorn.run(app, host=host, port=port, log_level="info")
-        
+        # Run the web server. Workers are separate processes, so uvicorn
+        # needs an import string to load the app in each of them
+        server_options = _server_implementations()
+        if server_options != {"loop": "uvloop", "http": "httptools"}:
+            print("ℹ️  uvloop/httptools not found; install nmap-ai[web] for a faster server")
+        # Logging every request is synchronous and costs more than serving
+        # small endpoints such as /health, so it is opt-in
+        uvicorn.run("nmap_ai.web.main:app", host=host, port=port,
+                    workers=workers, log_level="info" if verbose else "warning",
+                    access_log=verbose, **server_options)
+    
     except Exception as e:
         print(f"Error launching web interface: {e}")
         print("Please ensure web dependencies are installed: pip install nmap-ai[web]")
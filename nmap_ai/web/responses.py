@@ -0,0 +1,104 @@
+"""
+Response classes for the NMAP-AI web interface.
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Convert the non-JSON types that orjson encodes natively.
+    
+    Used by the standard library fallback so that both encoders accept
+    the same content and produce the same output.
+    
+    Args:
+        obj: Object json.dumps cannot encode
+    
+    Returns:
+        Any: JSON-compatible replacement
+    """
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    # numpy arrays and scalars, as with OPT_SERIALIZE_NUMPY
+    if type(obj).__module__ == "numpy" and hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def render_json(content: Any) -> bytes:
+    """
+    Encode content the way ORJSONResponse renders it.
+    
+    Args:
+        content: JSON types, plus datetimes, UUIDs, enums, dataclasses
+            and numpy values
+    
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is None:
+        return json.dumps(content, ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":"), default=_json_default).encode("utf-8")
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when it is installed.
+    
+    When an endpoint returns plain data, FastAPI converts it to
+    JSON-compatible types before render() is called. Endpoints that build
+    an ORJSONResponse themselves skip that step, so render_json encodes
+    datetimes, UUIDs, enums, dataclasses and numpy values directly. Falls
+    back to the standard library encoder, with the same conversions,
+    when orjson is missing.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header value against an ETag.
+    
+    Args:
+        if_none_match: Header value, if the request had one
+        etag: Quoted entity tag of the current representation
+    
+    Returns:
+        bool: True if the client's copy is current (answer with 304)
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
@@ -0,0 +1,135 @@
+"""
+Static file serving for the NMAP-AI web interface.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Tuple
+
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+
+from .responses import etag_matches
+
+# Browsers reuse static assets this long before revalidating them
+STATIC_MAX_AGE = 3600
+
+# Text assets worth compressing; images and fonts are already compressed
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.html', '.svg', '.json')
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a gzip response.
+    
+    A ``gzip`` entry decides on its own; otherwise ``*`` covers gzip.
+    Either is refused with ``q=0``.
+    
+    Args:
+        accept_encoding: Accept-Encoding request header value
+    
+    Returns:
+        bool: True if the client accepts gzip
+    """
+    wildcard = False
+    for token in accept_encoding.split(','):
+        coding, _, params = token.partition(';')
+        coding = coding.strip().lower()
+        if coding not in ('gzip', '*'):
+            continue
+        
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        
+        if coding == 'gzip':
+            return quality > 0
+        wildcard = quality > 0
+    return wildcard
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that lets browsers cache assets.
+    
+    Starlette already sends an ETag and Last-Modified for every file and
+    answers matching If-None-Match requests with 304; this adds a
+    Cache-Control max-age so returning visitors do not even revalidate
+    until it expires. Asset names are not content-hashed, so they are not
+    marked immutable.
+    
+    Text assets are gzipped once when the app starts and served from
+    memory to clients that accept gzip; everything else, and clients
+    that do not, go through StaticFiles as usual. Responses for assets
+    with a gzipped copy carry ``Vary: Accept-Encoding`` either way.
+    """
+    
+    def __init__(self, *args, max_age: int = STATIC_MAX_AGE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = f"public, max-age={max_age}"
+        self.gzipped = self._precompress()
+    
+    def _precompress(self) -> Dict[str, Tuple[bytes, str, str]]:
+        """
+        Gzip the text assets under the static directory.
+        
+        Returns:
+            Dict: Compressed body, ETag and media type keyed by the path
+            StaticFiles resolves for the asset
+        """
+        gzipped = {}
+        if self.directory is None:
+            return gzipped
+        
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(PRECOMPRESS_EXTENSIONS):
+                    continue
+                full_path = os.path.join(root, name)
+                with open(full_path, 'rb') as f:
+                    data = f.read()
+                body = gzip.compress(data, compresslevel=9, mtime=0)
+                if len(body) >= len(data):
+                    continue
+                
+                etag = '"%s-gzip"' % hashlib.blake2b(data, digest_size=8).hexdigest()
+                media_type = mimetypes.guess_type(name)[0] or 'text/plain'
+                path = os.path.normpath(os.path.relpath(full_path, self.directory))
+                gzipped[path] = (body, etag, media_type)
+        
+        return gzipped
+    
+    async def get_response(self, path: str, scope) -> Response:
+        entry = self.gzipped.get(path)
+        if entry is not None and scope["method"] == "GET":
+            headers = Headers(scope=scope)
+            if _accepts_gzip(headers.get("accept-encoding", "")):
+                body, etag, media_type = entry
+                response_headers = {
+                    "ETag": etag,
+                    "Cache-Control": self.cache_control,
+                    "Vary": "Accept-Encoding",
+                }
+                if etag_matches(headers.get("if-none-match"), etag):
+                    return Response(status_code=304, headers=response_headers)
+                response_headers["Content-Encoding"] = "gzip"
+                return Response(body, media_type=media_type, headers=response_headers)
+        
+        response = await super().get_response(path, scope)
+        if entry is not None:
+            # Shared caches must not hand this copy to gzip clients or vice versa
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+    
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
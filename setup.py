@@ -2,17 +2,22 @@
 Setup script for NMAP-AI package.
 """
 
+import os
 from setuptools import setup, find_packages
 from pathlib import Path
 
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
 # Read README file
 this_directory = Path(__file__).parent
 long_description = (this_directory / "README.md").read_text(encoding='utf-8')
 
-# Read requirements
-requirements = []
-with open('requirements.txt') as f:
-    requirements = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+# Runtime dependencies are declared in pyproject.toml ([project] dependencies),
+# which takes precedence over install_requires; requirements.txt pins the full
+# development environment and is not read here
 
 # Read development requirements
 dev_requirements = []
@@ -22,6 +27,39 @@ try:
 except FileNotFoundError:
     pass
 
+# Optional feature sets; "full" is their union so the lists cannot drift apart
+gui_requirements = [
+    "PyQt6>=6.4.0",
+    "pyqtgraph>=0.13.0",
+]
+web_requirements = [
+    "fastapi>=0.100.0",
+    "pydantic>=2.6.0",
+    "uvicorn[standard]>=0.20.0",
+    "jinja2>=3.1.0",
+    "orjson>=3.8.0",
+]
+ai_requirements = [
+    "tensorflow>=2.8.0",
+    "torch>=1.11.0",
+    "transformers>=4.20.0",
+    "scikit-learn>=1.0.0",
+]
+
+# Compile hot helpers when Cython is available (see nmap_ai/utils/helpers.pxd);
+# set NMAP_AI_NO_CYTHON=1 to install the pure-Python modules only. The
+# extensions are optional: without a C compiler the build warns and
+# installs the pure-Python modules instead of failing
+ext_modules = []
+if cythonize is not None and not os.environ.get("NMAP_AI_NO_CYTHON"):
+    ext_modules = cythonize(
+        ["nmap_ai/utils/helpers.py"],
+        compiler_directives={"language_level": "3", "annotation_typing": False},
+        quiet=True,
+    )
+    for extension in ext_modules:
+        extension.optional = True
+
 setup(
     name="nmap-ai",
     version="1.0.0",
@@ -31,7 +69,8 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/yashab-cyber/nmap-ai",
-    packages=find_packages(),
+    packages=find_packages(include=["nmap_ai", "nmap_ai.*"]),
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Information Technology",
@@ -50,54 +89,25 @@ setup(
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
     python_requires=">=3.8",
-    install_requires=requirements,
     extras_require={
         "dev": dev_requirements,
-        "gui": [
-            "PyQt6>=6.4.0",
-            "pyqtgraph>=0.13.0",
-        ],
-        "web": [
-            "fastapi>=0.95.0",
-            "uvicorn>=0.20.0",
-            "jinja2>=3.1.0",
-        ],
-        "ai": [
-            "tensorflow>=2.8.0",
-            "torch>=1.11.0",
-            "transformers>=4.20.0",
-            "scikit-learn>=1.0.0",
-        ],
-        "full": [
-            "PyQt6>=6.4.0",
-            "pyqtgraph>=0.13.0",
-            "fastapi>=0.95.0",
-            "uvicorn>=0.20.0",
-            "jinja2>=3.1.0",
-            "tensorflow>=2.8.0",
-            "torch>=1.11.0",
-            "transformers>=4.20.0",
-            "scikit-learn>=1.0.0",
-        ]
+        "gui": gui_requirements,
+        "web": web_requirements,
+        "ai": ai_requirements,
+        "full": gui_requirements + web_requirements + ai_requirements,
     },
     entry_points={
         "console_scripts": [
+            # One dispatcher; "nmap-ai gui" and "nmap-ai web" pick the interface
             "nmap-ai=nmap_ai.__main__:main",
-            "nmap-ai-cli=nmap_ai.cli.main:cli_main",
-            "nmap-ai-gui=nmap_ai.gui.main:gui_main",
-            "nmap-ai-web=nmap_ai.web.main:web_main",
         ],
     },
     include_package_data=True,
+    # Assets the web and GUI interfaces load from the installed package
     package_data={
-        "nmap_ai": [
-            "config/*.yaml",
-            "data/models/*",
-            "assets/*",
-            "assets/icons/*",
-            "assets/themes/*",
-            "assets/templates/*",
-        ],
+        "nmap_ai": ["utils/*.pxd"],
+        "nmap_ai.web": ["static/*.png", "static/css/*.css", "static/js/*.js", "templates/*.html"],
+        "nmap_ai.gui": ["resources/styles/*.qss", "resources/icons/*"],
     },
     project_urls={
         "Bug Reports": "https://github.com/yashab-cyber/nmap-ai/issues",
@@ -109,5 +119,6 @@ setup(
         "nmap", "network", "security", "scanning", "ai", "automation",
         "vulnerability", "penetration-testing", "cybersecurity", "infosec"
     ],
+    # StaticFiles and Jinja2 read the web assets from real directories
     zip_safe=False,
 )
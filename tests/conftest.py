@@ -3,8 +3,6 @@ Test configuration for NMAP-AI pytest setup.
 """
 
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
 import os
 import sys
@@ -18,10 +16,11 @@ from nmap_ai.utils.logger import get_logger
 
 
 @pytest.fixture(scope="session")
-def test_config():
+def test_config(tmp_path_factory):
     """Create a test configuration for all tests."""
     config = Config()
-    config.data_dir = tempfile.mkdtemp(prefix="nmap_ai_test_")
+    # pytest removes old base temp directories itself
+    config.data_dir = str(tmp_path_factory.mktemp("nmap_ai_test"))
     config.log_level = "DEBUG"
     config.debug = True
     return config
@@ -39,16 +38,11 @@ def temp_data_dir(test_config):
     (data_dir / "cache").mkdir(exist_ok=True)
     (data_dir / "logs").mkdir(exist_ok=True)
     
-    yield data_dir
-    
-    # Cleanup after all tests
-    shutil.rmtree(str(data_dir), ignore_errors=True)
+    return data_dir
 
 
-@pytest.fixture
-def sample_nmap_xml():
-    """Sample nmap XML output for testing."""
-    return """<?xml version="1.0"?>
+# Inline nmap output shared by the XML fixtures
+SAMPLE_NMAP_XML = """<?xml version="1.0"?>
 <nmaprun scanner="nmap" version="7.80" xmloutputversion="1.04">
     <host>
         <address addr="192.168.1.1" addrtype="ipv4"/>
@@ -71,6 +65,19 @@ def sample_nmap_xml():
 </nmaprun>"""
 
 
+@pytest.fixture(scope="session")
+def sample_nmap_xml():
+    """Sample nmap XML output for testing."""
+    return SAMPLE_NMAP_XML
+
+
+@pytest.fixture(scope="session")
+def sample_nmap_tree():
+    """Sample nmap XML output parsed once with lxml; do not modify it."""
+    etree = pytest.importorskip("lxml.etree")
+    return etree.fromstring(SAMPLE_NMAP_XML.encode('utf-8'))
+
+
 @pytest.fixture
 def sample_scan_results():
     """Sample parsed scan results for testing."""
@@ -127,6 +134,16 @@ def mock_vulnerability_data():
     ]
 
 
+@pytest.fixture(scope="session")
+def client():
+    """TestClient for the web app, started once for the whole session."""
+    testclient = pytest.importorskip("fastapi.testclient")
+    from nmap_ai.web.main import app
+    
+    with testclient.TestClient(app) as test_client:
+        yield test_client
+
+
 @pytest.fixture
 def logger():
     """Get a test logger instance."""
@@ -148,6 +165,9 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "ai: marks tests that use AI models"
     )
+    config.addinivalue_line(
+        "markers", "timeout: per-test timeout in seconds (pytest-timeout)"
+    )
 
 
 # Skip tests based on availability
@@ -167,8 +187,8 @@ def pytest_runtest_setup(item):
 
 
 # Timeout for slow tests
-def pytest_timeout_set_timer(item, timeout):
-    """Set timeout for tests."""
-    if "slow" in item.keywords:
-        return max(timeout, 300)  # 5 minutes for slow tests
-    return timeout
+def pytest_collection_modifyitems(items):
+    """Give slow tests 5 minutes when pytest-timeout is installed."""
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(pytest.mark.timeout(300))
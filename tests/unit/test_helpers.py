@@ -0,0 +1,191 @@
+"""
+Unit tests for the helper utilities module.
+"""
+
+import hashlib
+import os
+import socket
+from pathlib import Path
+
+import pytest
+
+from nmap_ai.utils.helpers import (
+    are_ports_open,
+    format_bytes,
+    get_file_hash,
+    hash_files,
+    is_port_open,
+    parse_nmap_xml,
+    parse_port_range,
+)
+
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+class TestFormatBytes:
+    """Test cases for format_bytes."""
+    
+    @pytest.mark.parametrize("value, expected", [
+        (0, "0.0 B"),
+        (1023, "1023.0 B"),
+        (1024, "1.0 KB"),
+        (2 ** 20 - 1, "1024.0 KB"),
+        (2 ** 20, "1.0 MB"),
+        (1.5 * 2 ** 30, "1.5 GB"),
+        (2 ** 60, "1024.0 PB"),
+        (float("inf"), "inf PB"),
+    ])
+    def test_units(self, value, expected):
+        """Test unit boundaries for integer and float inputs."""
+        assert format_bytes(value) == expected
+
+
+class TestFileHash:
+    """Test cases for get_file_hash."""
+    
+    @pytest.mark.parametrize("size", [0, 100, 64 * 1024, 2 * 1024 * 1024])
+    def test_matches_hashlib(self, tmp_path, size):
+        """Test hashes match hashlib for small and memory-mapped files."""
+        data = os.urandom(size)
+        file_path = tmp_path / "report.bin"
+        file_path.write_bytes(data)
+        
+        assert get_file_hash(str(file_path)) == hashlib.sha256(data).hexdigest()
+        assert get_file_hash(str(file_path), 'md5') == hashlib.md5(data).hexdigest()
+    
+    def test_missing_file(self, tmp_path):
+        """Test missing files raise ValueError."""
+        with pytest.raises(ValueError):
+            get_file_hash(str(tmp_path / "missing.bin"))
+    
+    def test_hash_files(self, tmp_path):
+        """Test batch hashing matches per-file hashing."""
+        paths = []
+        for index in range(4):
+            file_path = tmp_path / f"report_{index}.bin"
+            file_path.write_bytes(os.urandom(100 * 1024))
+            paths.append(str(file_path))
+        
+        assert hash_files(paths, workers=2) == {path: get_file_hash(path) for path in paths}
+        
+        with pytest.raises(ValueError):
+            hash_files(paths + [str(tmp_path / "missing.bin")])
+
+
+class TestParsePortRange:
+    """Test cases for parse_port_range."""
+    
+    def test_single_and_list(self):
+        """Test single ports and comma separated lists."""
+        assert parse_port_range("80") == [80]
+        assert parse_port_range("443, 22 ,80") == [22, 80, 443]
+    
+    def test_overlapping_ranges_are_deduplicated(self):
+        """Test overlapping ranges are merged and sorted."""
+        assert parse_port_range("1-5,3-7,2") == [1, 2, 3, 4, 5, 6, 7]
+    
+    def test_large_range(self):
+        """Test a full range spec takes the vectorized path correctly."""
+        ports = parse_port_range("1-65535,80")
+        assert len(ports) == 65535
+        assert ports[0] == 1 and ports[-1] == 65535
+        assert all(isinstance(port, int) for port in ports[:10])
+    
+    def test_huge_port_numbers(self):
+        """Test out-of-range numbers come back as parsed, compiled or not."""
+        assert parse_port_range("99999999999999999999") == [99999999999999999999]
+    
+    def test_invalid_spec(self):
+        """Test non-numeric specs raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_port_range("http")
+
+
+class TestArePortsOpen:
+    """Test cases for are_ports_open and is_port_open."""
+    
+    def test_local_listener(self):
+        """Test a listening port is reported open and a closed one is not."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen()
+            open_port = server.getsockname()[1]
+            
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                probe.bind(("127.0.0.1", 0))
+                closed_port = probe.getsockname()[1]
+            
+            results = are_ports_open("127.0.0.1", [open_port, closed_port], timeout=1.0)
+            
+            assert results == {open_port: True, closed_port: False}
+            assert is_port_open("127.0.0.1", open_port, timeout=1.0)
+    
+    def test_unresolvable_host(self):
+        """Test hosts that fail to resolve report every port closed."""
+        assert are_ports_open("host.invalid", [80, 443]) == {80: False, 443: False}
+
+
+class TestParseNmapXml:
+    """Test cases for parse_nmap_xml."""
+    
+    def test_parse_fixture(self):
+        """Test parsing the sample nmap XML fixture."""
+        results = parse_nmap_xml((FIXTURES_DIR / "nmap_sample.xml").read_text())
+        
+        assert results['scan_info']['type'] == 'syn'
+        assert results['run_stats']['elapsed'] == '2.34'
+        assert len(results['hosts']) == 1
+        
+        host = results['hosts'][0]
+        assert host['addresses'][0]['addr'] == '192.168.1.1'
+        assert host['hostnames'][0]['name'] == 'router.local'
+        assert [port['portid'] for port in host['ports']] == ['22', '80', '443']
+        assert host['ports'][0]['service']['product'] == 'OpenSSH'
+    
+    def test_parse_inline_xml(self, sample_nmap_xml):
+        """Test parsing the inline XML fixture, which has no scaninfo or runstats."""
+        results = parse_nmap_xml(sample_nmap_xml)
+        
+        assert results['scan_info'] == {}
+        assert results['run_stats'] == {}
+        assert len(results['hosts'][0]['ports']) == 3
+    
+    def test_matches_document_tree(self, sample_nmap_xml, sample_nmap_tree):
+        """Test the streaming parser agrees with the parsed document."""
+        results = parse_nmap_xml(sample_nmap_xml)
+        
+        expected = [port.get('portid') for port in sample_nmap_tree.iter('port')]
+        assert [port['portid'] for port in results['hosts'][0]['ports']] == expected
+    
+    def test_only_top_level_hosts(self):
+        """Test host elements nested below other elements are ignored."""
+        xml = (
+            '<nmaprun><host><address addr="10.0.0.1" addrtype="ipv4"/></host>'
+            '<wrapper><host><address addr="10.0.0.2"/></host></wrapper></nmaprun>'
+        )
+        results = parse_nmap_xml(xml)
+        
+        assert [h['addresses'][0]['addr'] for h in results['hosts']] == ['10.0.0.1']
+    
+    def test_first_match_wins(self):
+        """Test repeated single-valued elements keep the first occurrence."""
+        xml = (
+            '<nmaprun><runstats><hosts up="1"/></runstats>'
+            '<runstats><finished elapsed="9"/></runstats>'
+            '<host><status state="up"/><status state="down"/><ports>'
+            '<port portid="22"><state state="open"/><state state="closed"/></port>'
+            '</ports><ports><port portid="80"/></ports></host></nmaprun>'
+        )
+        results = parse_nmap_xml(xml)
+        host = results['hosts'][0]
+        
+        assert results['run_stats'] == {}
+        assert host['status']['state'] == 'up'
+        assert [port['portid'] for port in host['ports']] == ['22']
+        assert host['ports'][0]['state']['state'] == 'open'
+    
+    def test_invalid_xml(self):
+        """Test malformed XML raises ValueError."""
+        with pytest.raises(ValueError):
+            parse_nmap_xml('<nmaprun><host>')
@@ -0,0 +1,61 @@
+"""
+Unit tests for the nmap-ai entry point.
+"""
+
+import sys
+import types
+
+import pytest
+
+from nmap_ai.__main__ import main
+
+
+@pytest.fixture
+def interfaces(monkeypatch):
+    """Replace the CLI and web entry points with recorders."""
+    calls = []
+    cli = types.ModuleType("nmap_ai.cli.main")
+    cli.cli_main = lambda argv: calls.append(("cli", argv))
+    web = types.ModuleType("nmap_ai.web.main")
+    web.web_main = lambda **kwargs: calls.append(("web", kwargs))
+    monkeypatch.setitem(sys.modules, "nmap_ai.cli.main", cli)
+    monkeypatch.setitem(sys.modules, "nmap_ai.web.main", web)
+    return calls
+
+
+class TestMain:
+    """Test cases for interface dispatch."""
+    
+    def test_cli_keeps_web_option_names(self, interfaces):
+        """Test that options named like web options reach the CLI."""
+        main(["scan", "--target", "10.0.0.1", "--verbose", "--host", "a", "--workers", "2"])
+        
+        assert interfaces == [
+            ("cli", ["scan", "--target", "10.0.0.1", "--verbose", "--host", "a", "--workers", "2"])
+        ]
+    
+    def test_cli_help_reaches_cli(self, interfaces):
+        """Test that sub-command help is left to the CLI."""
+        main(["scan", "--help"])
+        
+        assert interfaces == [("cli", ["scan", "--help"])]
+    
+    @pytest.mark.parametrize("argv", [
+        ["web", "--port", "9000", "--verbose"],
+        ["--web", "--port", "9000", "--verbose"],
+        ["--port", "9000", "--web", "--verbose"],
+    ])
+    def test_web_options(self, interfaces, argv):
+        """Test the web sub-command and the --web flag."""
+        main(argv)
+        
+        assert interfaces == [
+            ("web", {'port': 9000, 'host': "localhost", 'workers': None, 'verbose': True})
+        ]
+    
+    def test_web_options_not_abbreviated(self, interfaces):
+        """Test that prefixes of web options are rejected."""
+        with pytest.raises(SystemExit):
+            main(["web", "--work", "2"])
+        
+        assert interfaces == []
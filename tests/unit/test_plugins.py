@@ -0,0 +1,153 @@
+"""
+Unit tests for the plugin base classes.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+from nmap_ai.plugins.base import PluginManager, PluginMetadata, ScannerPlugin
+
+
+# Plugin module with two scanner plugins and two classes that are not plugins
+PLUGIN_SOURCE = """
+from nmap_ai.plugins.base import PluginMetadata, ScannerPlugin
+
+
+class Helper:
+    pass
+
+
+class Impostor:
+    def __init__(self, config=None):
+        pass
+    
+    def initialize(self):
+        return True
+
+
+class FirstPlugin(ScannerPlugin):
+    metadata = PluginMetadata(name="first", version="1.0.0", description="",
+                              author="", license="MIT", dependencies=[],
+                              supported_platforms=["linux"])
+    
+    def initialize(self):
+        return True
+    
+    def cleanup(self):
+        return True
+    
+    def pre_scan_hook(self, targets, scan_options):
+        return scan_options
+    
+    def post_scan_hook(self, scan_results):
+        return scan_results
+
+
+class SecondPlugin(FirstPlugin):
+    pass
+"""
+
+
+class TestPluginMetadata:
+    """Test cases for PluginMetadata."""
+    
+    def test_hashable(self):
+        """Test that metadata built from lists can be hashed and compared."""
+        fields = dict(
+            name="example",
+            version="1.0.0",
+            description="Example plugin",
+            author="NMAP-AI",
+            license="MIT"
+        )
+        from_lists = PluginMetadata(dependencies=["requests"],
+                                    supported_platforms=["linux", "darwin"], **fields)
+        from_tuples = PluginMetadata(dependencies=("requests",),
+                                     supported_platforms=("linux", "darwin"), **fields)
+        
+        assert from_lists.dependencies == ("requests",)
+        assert from_lists == from_tuples
+        assert len({from_lists, from_tuples}) == 1
+
+
+class TestDiscoverPlugins:
+    """Test cases for PluginManager.discover_plugins."""
+    
+    def test_unusable_dirs_skipped(self, tmp_path):
+        """Test that missing paths and files are skipped."""
+        plugin_dir = tmp_path / "plugins"
+        plugin_dir.mkdir()
+        (plugin_dir / "example.py").write_text("")
+        not_a_dir = tmp_path / "plugin.py"
+        not_a_dir.write_text("")
+        
+        manager = PluginManager([tmp_path / "missing", not_a_dir, plugin_dir])
+        
+        assert manager.discover_plugins() == ["example"]
+    
+    def test_settled_listing_cached(self, tmp_path):
+        """Test that an unchanged, settled directory is not listed again."""
+        (tmp_path / "first.py").write_text("")
+        old_ns = time.time_ns() - 3600 * 10**9
+        os.utime(tmp_path, ns=(old_ns, old_ns))
+        manager = PluginManager([tmp_path])
+        manager.discover_plugins()
+        
+        (tmp_path / "second.py").write_text("")
+        os.utime(tmp_path, ns=(old_ns, old_ns))
+        
+        assert manager.discover_plugins() == ["first"]
+    
+    def test_recent_listing_not_cached(self, tmp_path):
+        """Test that entries added within the same mtime tick are found."""
+        (tmp_path / "first.py").write_text("")
+        mtime_ns = tmp_path.stat().st_mtime_ns
+        manager = PluginManager([tmp_path])
+        manager.discover_plugins()
+        
+        (tmp_path / "second.py").write_text("")
+        os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+        
+        assert sorted(manager.discover_plugins()) == ["first", "second"]
+
+
+@pytest.fixture
+def plugin_manager(tmp_path):
+    """PluginManager over a temporary directory, unloading plugins afterwards."""
+    before = set(sys.modules)
+    yield PluginManager([tmp_path])
+    for module_name in set(sys.modules) - before:
+        del sys.modules[module_name]
+
+
+class TestLoadPlugin:
+    """Test cases for PluginManager.load_plugin."""
+    
+    def test_plugin_class_declared(self, plugin_manager, tmp_path):
+        """Test that PLUGIN_CLASS picks the entry class."""
+        (tmp_path / "declared.py").write_text(PLUGIN_SOURCE + "\nPLUGIN_CLASS = SecondPlugin\n")
+        
+        assert plugin_manager.load_plugin("declared")
+        assert type(plugin_manager.get_plugin("declared")).__name__ == "SecondPlugin"
+        assert plugin_manager.has_capability(ScannerPlugin.CAPABILITIES)
+    
+    def test_first_plugin_class_fallback(self, plugin_manager, tmp_path):
+        """Test that the first plugin class defined in the module is used."""
+        (tmp_path / "undeclared.py").write_text(PLUGIN_SOURCE)
+        
+        assert plugin_manager.load_plugin("undeclared")
+        assert type(plugin_manager.get_plugin("undeclared")).__name__ == "FirstPlugin"
+    
+    @pytest.mark.parametrize("declared", ["Helper", "Impostor", "FirstPlugin()", "'FirstPlugin'"])
+    def test_invalid_plugin_class(self, plugin_manager, tmp_path, caplog, declared):
+        """Test that a PLUGIN_CLASS which is not a plugin class is rejected."""
+        (tmp_path / "invalid.py").write_text(PLUGIN_SOURCE + f"\nPLUGIN_CLASS = {declared}\n")
+        
+        assert not plugin_manager.load_plugin("invalid")
+        assert "is not a BasePlugin subclass" in caplog.text
+        assert plugin_manager.get_plugin("invalid") is None
+        assert "nmap_ai_plugin_invalid" not in sys.modules
+        assert not plugin_manager.has_capability(ScannerPlugin.CAPABILITIES)
@@ -0,0 +1,82 @@
+"""
+Unit tests for the web JSON responses.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from enum import Enum
+from uuid import UUID
+
+import pytest
+
+from nmap_ai.web import responses
+from nmap_ai.web.responses import render_json
+
+
+class Severity(Enum):
+    """Enum member encoded by its value."""
+    HIGH = "high"
+
+
+@dataclass
+class Finding:
+    """Dataclass encoded as an object."""
+    port: int
+    severity: Severity
+
+
+def _content():
+    """Content with every non-JSON type render_json accepts."""
+    np = pytest.importorskip("numpy")
+    return {
+        'scan_id': UUID("12345678-1234-5678-1234-567812345678"),
+        'started_at': datetime(2024, 5, 1, 12, 30, 15, 250000),
+        'completed_at': datetime(2024, 5, 1, 12, 31, tzinfo=timezone.utc),
+        'day': date(2024, 5, 1),
+        'findings': [Finding(22, Severity.HIGH)],
+        'ports': np.array([22, 80, 443]),
+        'score': np.float64(7.5),
+        'count': np.int64(3),
+        'host': "scanné",
+    }
+
+
+class TestRenderJson:
+    """Test cases for render_json."""
+    
+    def test_fallback_encodes_extra_types(self, monkeypatch):
+        """Test the standard library fallback on non-JSON types."""
+        content = _content()
+        monkeypatch.setattr(responses, "orjson", None)
+        
+        data = json.loads(render_json(content))
+        
+        assert data == {
+            'scan_id': "12345678-1234-5678-1234-567812345678",
+            'started_at': "2024-05-01T12:30:15.250000",
+            'completed_at': "2024-05-01T12:31:00+00:00",
+            'day': "2024-05-01",
+            'findings': [{'port': 22, 'severity': "high"}],
+            'ports': [22, 80, 443],
+            'score': 7.5,
+            'count': 3,
+            'host': "scanné",
+        }
+    
+    def test_fallback_matches_orjson(self, monkeypatch):
+        """Test that both encoders produce the same bytes."""
+        if responses.orjson is None:
+            pytest.skip("orjson not installed")
+        content = _content()
+        encoded = render_json(content)
+        monkeypatch.setattr(responses, "orjson", None)
+        
+        assert render_json(content) == encoded
+    
+    def test_fallback_rejects_unknown_types(self, monkeypatch):
+        """Test that other objects still raise TypeError."""
+        monkeypatch.setattr(responses, "orjson", None)
+        
+        with pytest.raises(TypeError):
+            render_json({'value': object()})
@@ -0,0 +1,155 @@
+"""
+Unit tests for the web API scan queue.
+"""
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+pytest.importorskip("fastapi.testclient")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nmap_ai.config import Config
+from nmap_ai.web.api import endpoints
+from nmap_ai.web.api.endpoints import get_config, router
+from nmap_ai.web.api.store import MemoryScanStore, get_scan_store
+
+
+class _StubScanner:
+    """NmapAIScanner stand-in that returns once the test releases it."""
+    
+    release = None
+    targets = None
+    
+    def __init__(self, ai_enabled=True):
+        self.ai_enabled = ai_enabled
+    
+    def scan(self, target, **kwargs):
+        self.targets.append(target)
+        self.release.wait(5)
+        return {'hosts': [target], 'ai_enabled': self.ai_enabled}
+
+
+class _StubSmartScanner:
+    """SmartScanner stand-in that answers straight away."""
+    
+    def smart_scan(self, target):
+        return {'hosts': [target], 'smart': True}
+
+
+@pytest.fixture
+def scanner(monkeypatch):
+    """Replace the nmap scanner with _StubScanner."""
+    monkeypatch.setattr(_StubScanner, "release", threading.Event())
+    monkeypatch.setattr(_StubScanner, "targets", [])
+    module = types.ModuleType("nmap_ai.core.scanner")
+    module.NmapAIScanner = _StubScanner
+    monkeypatch.setitem(sys.modules, "nmap_ai.core.scanner", module)
+    yield _StubScanner
+    _StubScanner.release.set()
+
+
+@pytest.fixture
+def api(scanner, monkeypatch):
+    """TestClient for the API router with its own store and configuration."""
+    monkeypatch.setattr(endpoints, "_scan_queue", None)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    store = MemoryScanStore()
+    config = Config()
+    app.dependency_overrides[get_scan_store] = lambda: store
+    app.dependency_overrides[get_config] = lambda: config
+    with TestClient(app) as client:
+        yield client
+        scanner.release.set()
+
+
+def _start(api, target="127.0.0.1"):
+    """Start a scan and return the response."""
+    return api.post("/api/scan/start", json={"target": target})
+
+
+def _wait_for(api, scan_id, status):
+    """Poll a scan until it reaches a status."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        scan_info = api.get(f"/api/scan/{scan_id}/status").json()
+        if scan_info['status'] == status:
+            return scan_info
+        time.sleep(0.01)
+    raise AssertionError(f"Scan {scan_id} never reached {status}: {scan_info}")
+
+
+class TestScanQueue:
+    """Test cases for the scan queue and its workers."""
+    
+    def test_full_queue_rejected(self, api, scanner, monkeypatch):
+        """Test that scans beyond the queue size get 429."""
+        monkeypatch.setattr(endpoints, "MAX_CONCURRENT_SCANS", 1)
+        monkeypatch.setattr(endpoints, "SCAN_QUEUE_SIZE", 1)
+        
+        running = _start(api, "10.0.0.1").json()['scan_id']
+        _wait_for(api, running, 'running')
+        assert _start(api, "10.0.0.2").status_code == 200
+        
+        response = _start(api, "10.0.0.3")
+        
+        assert response.status_code == 429
+        assert scanner.targets == ["10.0.0.1"]
+    
+    def test_queued_scan_cancelled(self, api, scanner, monkeypatch):
+        """Test that a scan cancelled while queued is never run."""
+        monkeypatch.setattr(endpoints, "MAX_CONCURRENT_SCANS", 1)
+        
+        running = _start(api, "10.0.0.1").json()['scan_id']
+        _wait_for(api, running, 'running')
+        queued = _start(api, "10.0.0.2").json()['scan_id']
+        
+        assert api.delete(f"/api/scan/{queued}").status_code == 200
+        scanner.release.set()
+        _wait_for(api, running, 'completed')
+        
+        assert scanner.targets == ["10.0.0.1"]
+        assert api.get(f"/api/scan/{queued}/status").json()['status'] == 'cancelled'
+    
+    def test_max_threads_applied_per_scan(self, api, scanner):
+        """Test that lowering max_threads holds back later scans."""
+        assert api.put("/api/config", json={"scanning": {"max_threads": 1}}).status_code == 200
+        
+        running = _start(api, "10.0.0.1").json()['scan_id']
+        _wait_for(api, running, 'running')
+        held = _start(api, "10.0.0.2").json()['scan_id']
+        time.sleep(0.1)
+        
+        assert api.get(f"/api/scan/{held}/status").json()['status'] == 'starting'
+        scanner.release.set()
+        _wait_for(api, held, 'completed')
+        assert scanner.targets == ["10.0.0.1", "10.0.0.2"]
+    
+    def test_scan_completed(self, api, scanner):
+        """Test that a scan runs without AI and its results are stored."""
+        scanner.release.set()
+        scan_id = _start(api, "10.0.0.1").json()['scan_id']
+        
+        _wait_for(api, scan_id, 'completed')
+        
+        results = api.get(f"/api/scan/{scan_id}/results").json()
+        assert results == {'hosts': ["10.0.0.1"], 'ai_enabled': False}
+    
+    def test_smart_scan_completed(self, api, monkeypatch):
+        """Test that AI scans go through SmartScanner.smart_scan."""
+        module = types.ModuleType("nmap_ai.ai.smart_scanner")
+        module.SmartScanner = _StubSmartScanner
+        monkeypatch.setitem(sys.modules, "nmap_ai.ai.smart_scanner", module)
+        
+        response = api.post("/api/scan/start", json={"target": "10.0.0.1", "ai_scan": True})
+        scan_id = response.json()['scan_id']
+        _wait_for(api, scan_id, 'completed')
+        
+        results = api.get(f"/api/scan/{scan_id}/results").json()
+        assert results == {'hosts': ["10.0.0.1"], 'smart': True}
@@ -0,0 +1,99 @@
+"""
+Unit tests for the web API scan store.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from nmap_ai.web.api.store import MemoryScanStore, ScanExpired, ScanStore
+
+
+class TestMemoryScanStore:
+    """Test cases for MemoryScanStore."""
+    
+    def test_scan_lifecycle(self):
+        """Test a scan moving from active to completed."""
+        async def scenario():
+            store = MemoryScanStore()
+            await store.put_active("scan-1", {
+                'scan_id': "scan-1",
+                'status': 'starting',
+                'started_at': datetime.now(),
+                'progress': 0,
+                'target': "10.0.0.1"
+            })
+            await store.update("scan-1", status='running', progress=30)
+            running = await store.get("scan-1")
+            
+            await store.put_result("scan-1", {
+                'scan_id': "scan-1",
+                'target': "10.0.0.1",
+                'started_at': running['started_at'],
+                'completed_at': datetime.now(),
+                'results': {'hosts': []}
+            })
+            return running, await store.get("scan-1"), await store.get_result("scan-1")
+        
+        running, completed, record = asyncio.run(scenario())
+        
+        assert (running['status'], running['progress']) == ('running', 30)
+        assert completed['status'] == 'completed'
+        assert 'results' not in completed
+        assert record['results'] == {'hosts': []}
+    
+    def test_unknown_scan(self):
+        """Test lookups and updates of unknown scans."""
+        async def scenario():
+            store = MemoryScanStore()
+            await store.update("missing", status='cancelled')
+            return await store.get("missing"), await store.get_result("missing"), await store.list()
+        
+        assert asyncio.run(scenario()) == (None, None, [])
+    
+    def test_oldest_results_evicted(self):
+        """Test that only the newest max_results completed scans are kept."""
+        async def scenario():
+            store = MemoryScanStore(max_results=1)
+            for scan_id in ("scan-1", "scan-2"):
+                await store.put_result(scan_id, {
+                    'scan_id': scan_id,
+                    'target': "10.0.0.1",
+                    'completed_at': datetime.now(),
+                    'results': {'hosts': []}
+                })
+            latest = await store.get_result("scan-2")
+            scans = await store.list()
+            with pytest.raises(ScanExpired):
+                await store.get_result("scan-1")
+            return latest, scans
+        
+        latest, scans = asyncio.run(scenario())
+        
+        assert latest['results'] == {'hosts': []}
+        assert [scan['scan_id'] for scan in scans] == ["scan-2"]
+    
+    def test_scans_expire(self):
+        """Test that scans are dropped once their TTL has passed."""
+        async def scenario():
+            store = MemoryScanStore(ttl=0)
+            await store.put_active("scan-1", {'scan_id': "scan-1", 'status': 'running'})
+            with pytest.raises(ScanExpired):
+                await store.get_result("scan-1")
+            return await store.get("scan-1"), await store.list()
+        
+        assert asyncio.run(scenario()) == (None, [])
+
+
+class TestScanStore:
+    """Test cases for the ScanStore interface."""
+    
+    def test_incomplete_store_rejected(self):
+        """Test that a store missing interface methods cannot be created."""
+        class PartialStore(ScanStore):
+            async def get(self, scan_id):
+                return None
+        
+        with pytest.raises(TypeError):
+            PartialStore()
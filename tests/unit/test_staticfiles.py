@@ -0,0 +1,94 @@
+"""
+Unit tests for the web static file serving.
+"""
+
+import pytest
+
+pytest.importorskip("fastapi.testclient")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nmap_ai.web.staticfiles import CachedStaticFiles, _accepts_gzip
+
+
+SCRIPT = "function scan() { return 'nmap-ai'; }\n" * 50
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    """TestClient serving a compressible script and a small image."""
+    (tmp_path / "app.js").write_text(SCRIPT)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    app = FastAPI()
+    app.mount("/static", CachedStaticFiles(directory=tmp_path), name="static")
+    with TestClient(app) as client:
+        yield client
+
+
+class TestAcceptsGzip:
+    """Test cases for _accepts_gzip."""
+    
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", True),
+        ("GZIP;q=0.5", True),
+        ("br, *", True),
+        ("", False),
+        ("identity", False),
+        ("gzip;q=0", False),
+        ("gzip;q=0.0, *", False),
+        ("*;q=0", False),
+        ("gzip;q=0, *;q=1", False),
+        ("gzip;q=bogus", False),
+        ("x-gzipped", False),
+    ])
+    def test_header(self, header, expected):
+        """Test Accept-Encoding values with and without quality values."""
+        assert _accepts_gzip(header) is expected
+
+
+class TestCachedStaticFiles:
+    """Test cases for CachedStaticFiles."""
+    
+    def test_gzip_response(self, static_client):
+        """Test that gzip clients get the precompressed copy."""
+        response = static_client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"].endswith('-gzip"')
+        assert response.text == SCRIPT
+    
+    def test_gzip_not_modified(self, static_client):
+        """Test that a matching If-None-Match gets 304 without a body."""
+        etag = static_client.get("/static/app.js", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+        
+        response = static_client.get("/static/app.js", headers={
+            "Accept-Encoding": "gzip",
+            "If-None-Match": etag
+        })
+        
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["vary"] == "Accept-Encoding"
+    
+    @pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0, identity"])
+    def test_uncompressed_fallback(self, static_client, accept_encoding):
+        """Test that other clients get the file with Vary set."""
+        response = static_client.get("/static/app.js", headers={"Accept-Encoding": accept_encoding})
+        
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["cache-control"] == "public, max-age=3600"
+        assert response.text == SCRIPT
+    
+    def test_uncompressed_asset(self, static_client):
+        """Test that assets without a gzipped copy are served as they are."""
+        response = static_client.get("/static/logo.png", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+        assert response.headers["cache-control"] == "public, max-age=3600"
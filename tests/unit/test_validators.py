@@ -0,0 +1,61 @@
+"""
+Unit tests for the input validators module.
+"""
+
+import pytest
+
+from nmap_ai.utils import validators
+from nmap_ai.utils.validators import validate_ports
+
+
+PORT_SPECS = [
+    "80",
+    "22,80,443",
+    "1-1000",
+    " 22 , 80-90 ,443 ",
+    "80,,443",
+    "65535",
+    "0",
+    "65536",
+    "1-65536",
+    "100-10",
+    "80-80",
+    "80-",
+    "-80",
+    "1-2-3",
+    "80,abc",
+    "8 0",
+    "99999999999999999999",
+    ",".join(str(port) for port in range(1, 200)),
+    ",".join(f"{port}-{port + 1}" for port in range(1, 400, 2)),
+    ",".join(str(port) for port in range(1, 200)) + ",70000",
+    ",".join(str(port) for port in range(1, 200)) + ",90-80",
+    ",".join(str(port) for port in range(1, 200)) + ",8x",
+]
+
+
+class TestValidatePorts:
+    """Test cases for validate_ports."""
+    
+    def test_valid_specs(self):
+        """Test accepted port specifications."""
+        for spec in ("80", "22,80,443", "1-1000", "all", " 22 , 80-90 "):
+            assert validate_ports(spec), spec
+    
+    def test_invalid_specs(self):
+        """Test rejected port specifications."""
+        for spec in ("", "0", "65536", "100-10", "80-", "1-2-3", "80,abc"):
+            assert not validate_ports(spec), spec
+    
+    def test_numba_kernel_matches_python(self, monkeypatch):
+        """Test the Numba kernel and the pure-Python path agree."""
+        pytest.importorskip("numba")
+        
+        monkeypatch.setattr(validators, "_NUMBA_MIN_LENGTH", 10 ** 9)
+        python_results = [validate_ports(spec) for spec in PORT_SPECS]
+        
+        monkeypatch.setattr(validators, "_NUMBA_MIN_LENGTH", 0)
+        kernel_results = [validate_ports(spec) for spec in PORT_SPECS]
+        
+        assert kernel_results == python_results
+        assert any(python_results) and not all(python_results)